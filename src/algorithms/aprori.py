@@ -4,6 +4,9 @@ from typing import Any, Dict, List, Set, Tuple
 
 from loguru import logger
 
+from utils import metrics
+from utils.constraints import MiningConstraints, filter_transactions
+
 
 def itemset_join(
     left_itemset: Set[Tuple[Any]],
@@ -59,18 +62,23 @@ def itemset_join(
 def find_frequent_itemset(
     transactions: List[List[Any]],
     minsup: float,
+    constraints: MiningConstraints = None,
 ):
     """Find frequent itemset by aprori algorithm
 
     Args:
         transactions (List[List[Any]]): List of Transactions. For each transaction, it stores items in List format.
         minsup (int): minimum support for finding frequent itemset
+        constraints (MiningConstraints, optional): item filters and maximum length of itemsets. Defaults to None.
     """
     # TODO: combine duplicated and similar pattern in this function
 
     # Evaluate minimum support count
     minsup_count = round(minsup * len(transactions))
 
+    # Drop items which are not allowed, they never join into candidates
+    transactions = filter_transactions(transactions, constraints)
+
     # Record k-frequent itemset with support count
     # Dict[k value, k-frequent itemset in dict format]
     #               => Dict[itemset in tuple format, support count of itemset]
@@ -79,55 +87,67 @@ def find_frequent_itemset(
 
     logger.debug("Find 1-frequent itemset by scanning transaction")
     candidate_itemset: Dict[Any, int] = {}  # Record candidate itemset with support count
-    # Collect all 1-candidate itemsets by scanning transactions
-    for transaction in transactions:
-        for item in transaction:
-            candidate_itemset[item] = (
-                candidate_itemset[item] + 1
-                if item in candidate_itemset
-                else 1
-            )
+    with metrics.phase("aprori.level_1"):
+        # Collect all 1-candidate itemsets by scanning transactions
+        for transaction in transactions:
+            for item in transaction:
+                candidate_itemset[item] = (
+                    candidate_itemset[item] + 1
+                    if item in candidate_itemset
+                    else 1
+                )
 
-    # Filter candidate itemset with minimum support
-    k_frequent_itemset[1] = {
-        (item,): candidate_itemset[item]    # Key: Itemset in Tuple format, Value: support count of itemset
-        for item in candidate_itemset
-        if candidate_itemset[item] >= minsup_count
-    }
+        # Filter candidate itemset with minimum support
+        k_frequent_itemset[1] = {
+            (item,): candidate_itemset[item]    # Key: Itemset in Tuple format, Value: support count of itemset
+            for item in candidate_itemset
+            if candidate_itemset[item] >= minsup_count
+        }
     logger.debug(f"Found {len(k_frequent_itemset[1])} 1-frequent itemset(s)")
+    metrics.record("aprori.level_1.candidates", len(candidate_itemset))
+    metrics.record("aprori.level_1.frequent", len(k_frequent_itemset[1]))
 
     # Loop while 1-frequent itemset is not empty, until count of k-frequent itemset is zero
     k_value = 2
     while len(k_frequent_itemset[1]):
+        # Stop generating candidates longer than maximum length, keep the trailing empty level
+        if constraints is not None and not constraints.allows_length(k_value):
+            k_frequent_itemset[k_value] = dict()
+            break
+
         logger.debug(f"Find {k_value}-frequent itemset by scanning transaction")
 
         # Clear all elements in candidate_itemset_suppout
         candidate_itemset.clear()
 
-        # Obtain k-candidate itemset within join operation on k-1 itemset
-        candidate_itemset = {
-            itemset: 0
-            for itemset in itemset_join(
-                k_frequent_itemset[k_value - 1],
-                k_frequent_itemset[k_value - 1],
-                k_value
-            )
-        }
-
-        # Scan transactions to evaluate support value
-        for transaction in transactions:
-            for itemset in candidate_itemset:
-                if all(item in transaction for item in itemset):
-                    candidate_itemset[itemset] += 1
-
-        # Select k-frequent itemset with minimum support
-        k_frequent_itemset[k_value] = {
-            itemset: candidate_itemset[itemset]      # Key: Itemset in Tuple format, Value: support count of itemset
-            for itemset in candidate_itemset
-            if candidate_itemset[itemset] >= minsup_count
-        }
+        with metrics.phase(f"aprori.level_{k_value}.join"):
+            # Obtain k-candidate itemset within join operation on k-1 itemset
+            candidate_itemset = {
+                itemset: 0
+                for itemset in itemset_join(
+                    k_frequent_itemset[k_value - 1],
+                    k_frequent_itemset[k_value - 1],
+                    k_value
+                )
+            }
+
+        with metrics.phase(f"aprori.level_{k_value}.count"):
+            # Scan transactions to evaluate support value
+            for transaction in transactions:
+                for itemset in candidate_itemset:
+                    if all(item in transaction for item in itemset):
+                        candidate_itemset[itemset] += 1
+
+            # Select k-frequent itemset with minimum support
+            k_frequent_itemset[k_value] = {
+                itemset: candidate_itemset[itemset]      # Key: Itemset in Tuple format, Value: support count of itemset
+                for itemset in candidate_itemset
+                if candidate_itemset[itemset] >= minsup_count
+            }
 
         logger.debug(f"Found {len(k_frequent_itemset[k_value])} {k_value}-frequent itemset(s)")
+        metrics.record(f"aprori.level_{k_value}.candidates", len(candidate_itemset))
+        metrics.record(f"aprori.level_{k_value}.frequent", len(k_frequent_itemset[k_value]))
 
         # Stop looping if there are no any new frequent itemset found
         if len(k_frequent_itemset[k_value]) == 0:
@@ -142,6 +162,7 @@ def find_frequent_itemset(
 def find_association_rule(
     k_frequent_itemset: Dict[int, Dict[Tuple[Any], int]],
     minconf: float,
+    constraints: MiningConstraints = None,
 ):
     """Find association rules by aprori algorithm
 
@@ -149,6 +170,8 @@ def find_association_rule(
         transactions (List[List[Any]]): List of Transactions. For each transaction, it stores items in List format.
         minsup (int): minimum support for finding frequent itemset
         minconf (int): minimum confidence for finding frequent itemset
+        constraints (MiningConstraints, optional): required items and maximum length of antecedent and consequent.
+            Defaults to None.
     """
 
     # Record association rules for specific frequent itemset with confidence value
@@ -163,6 +186,10 @@ def find_association_rule(
     # Traverse all frequent itemset with different rule length where length >= 2
     for rule_length in range(2, len(k_frequent_itemset)):
         for itemset in k_frequent_itemset[rule_length]:
+            # Pruning - Skip itemsets without items required by rule constraints
+            if constraints is not None and not constraints.may_contain_rule(itemset):
+                continue
+
             found_association_rules: Dict[int, Dict[Tuple[Any], float]] = dict()
 
             # For each frequent itemset, initially generate rule with length <(rule_length - 1) -> 1>
@@ -190,8 +217,10 @@ def find_association_rule(
                     else 0.0
                 )
 
-                # Filter by minimum confidence threshold
-                if confidence >= minconf:
+                # Filter by minimum confidence threshold and required antecedent items
+                if confidence >= minconf and (
+                    constraints is None or constraints.is_antecedent_viable(candidate_rule[0])
+                ):
                     # Dict operation for creating key for specific rule output length
                     if 1 not in found_association_rules:
                         found_association_rules[1] = dict()
@@ -209,7 +238,7 @@ def find_association_rule(
 
             # Rule expansion and evaluate confidence value while rule length is bigger than 2
             rule_oplen = 2
-            while rule_length > 2:
+            while rule_length > 2 and (constraints is None or constraints.allows_consequent_length(rule_oplen)):
                 # Collect source for rule expansion
                 rule_expand_source = list(found_association_rules[rule_oplen - 1].keys())
 
@@ -247,8 +276,10 @@ def find_association_rule(
                         k_frequent_itemset[rule_length - rule_oplen][candidate_rule[0]]
                     )
 
-                    # Filter by minimum confidence threshold
-                    if confidence >= minconf:
+                    # Filter by minimum confidence threshold and required antecedent items
+                    if confidence >= minconf and (
+                        constraints is None or constraints.is_antecedent_viable(candidate_rule[0])
+                    ):
                         # Dict operation for creating key for specific rule output length
                         if rule_oplen not in found_association_rules:
                             found_association_rules[rule_oplen] = dict()
@@ -267,10 +298,29 @@ def find_association_rule(
                 # Add rule output length for next iteration
                 rule_oplen += 1
 
+            # Drop rules which are kept only as source of rule expansion under rule constraints
+            if constraints is not None and constraints.has_rule_constraint():
+                for oplen in list(found_association_rules):
+                    accepted_rules = {
+                        rule: confidence
+                        for rule, confidence in found_association_rules[oplen].items()
+                        if constraints.accepts_rule(rule[0], rule[1])
+                    }
+                    total_rule_count -= len(found_association_rules[oplen]) - len(accepted_rules)
+
+                    if len(accepted_rules) > 0:
+                        found_association_rules[oplen] = accepted_rules
+                    else:
+                        del found_association_rules[oplen]
+
+                if len(found_association_rules) == 0:
+                    continue
+
             # Add found rules to final association rules set
             final_association_rules[itemset] = found_association_rules
 
     logger.debug(f"Found {total_rule_count} valid association rules")
+    metrics.record("aprori.rules", total_rule_count)
 
     return final_association_rules
 
@@ -0,0 +1,142 @@
+import sys
+from typing import Any, Dict, List, Set, Tuple
+
+from loguru import logger
+
+from utils import metrics, transaction_encoder
+from utils.constraints import MiningConstraints, filter_transactions
+
+
+def build_tidsets(encoded_transactions: List[Tuple[int]], item_count: int) -> List[Set[int]]:
+    """Build vertical representation, tidset of an item contains IDs of transactions which contain the item
+
+    Args:
+        encoded_transactions (List[Tuple[int]]): transactions of item IDs
+        item_count (int): count of item IDs
+
+    Returns:
+        List[Set[int]]: item ID -> tidset
+    """
+    tidsets: List[Set[int]] = [set() for _ in range(item_count)]
+    for tid, transaction in enumerate(encoded_transactions):
+        for item_id in transaction:
+            tidsets[item_id].add(tid)
+    return tidsets
+
+
+def mine_equivalence_class(
+    equivalence_class: List[Tuple[Tuple[int], Set[int], int]],
+    minsup_count: int,
+    frequent_itemset: Dict[Tuple[int], int],
+    max_length: int = None,
+) -> None:
+    """dEclat on diffsets, extend itemsets sharing the same prefix depth-first
+
+    For prefix P and members PX, PY, diffset d(PX) = t(P) - t(PX). The extension PXY has
+    d(PXY) = d(PY) - d(PX) and support(PXY) = support(PX) - |d(PXY)|.
+
+    Args:
+        equivalence_class (List[Tuple[Tuple[int], Set[int], int]]): (itemset, diffset, support count) of frequent
+            itemsets which differ in the last item only, ordered by the last item in ascending support
+        minsup_count (int): minimum support count
+        frequent_itemset (Dict[Tuple[int], int]): found itemsets are added into it
+        max_length (int, optional): maximum length of itemsets, None for unlimited. Defaults to None.
+    """
+    # Pruning - Extensions of this class would exceed maximum length
+    if max_length is not None and len(equivalence_class[0][0]) >= max_length:
+        return
+
+    diffset_size = 0
+
+    for i, (itemset_i, diffset_i, support_i) in enumerate(equivalence_class):
+        child_class: List[Tuple[Tuple[int], Set[int], int]] = []
+
+        for itemset_j, diffset_j, _ in equivalence_class[i + 1:]:
+            diffset = diffset_j - diffset_i
+            support_count = support_i - len(diffset)
+            if support_count >= minsup_count:
+                child_class.append((itemset_i + itemset_j[-1:], diffset, support_count))
+                diffset_size += len(diffset)
+
+        for itemset, _, support_count in child_class:
+            frequent_itemset[itemset] = support_count
+
+        if len(child_class) > 1:
+            mine_equivalence_class(child_class, minsup_count, frequent_itemset, max_length)
+
+    metrics.increment("declat.diffset_size", diffset_size)
+
+
+@logger.catch(onerror=lambda _: sys.exit(1))
+def find_frequent_itemset(
+    transactions: List[List[Any]],
+    minsup: float,
+    constraints: MiningConstraints = None,
+) -> Dict[int, Dict[Tuple[Any], int]]:
+    """Find frequent itemset by dEclat, vertical mining on diffsets relative to the parent prefix
+
+    Args:
+        transactions (List[List[Any]]): List of Transactions. For each transaction, it stores items in List format.
+        minsup (float): minimum support for finding frequent itemset
+        constraints (MiningConstraints, optional): item filters and maximum length of itemsets. Defaults to None.
+
+    Returns:
+        Dict[int, Dict[Tuple[Any], int]]: k-frequent itemset
+    """
+    # Evaluate minimum support count
+    minsup_count = round(minsup * len(transactions))
+    max_length = constraints.max_length if constraints is not None else None
+
+    # Drop items which are not allowed, they never get a tidset
+    transactions = filter_transactions(transactions, constraints)
+
+    logger.debug("Find 1-frequent itemset by scanning transaction")
+    with metrics.phase("declat.encode"):
+        encoded_transactions, items, item_supports = transaction_encoder.encode_transactions(transactions, minsup_count)
+    logger.debug(f"Found {len(items)} 1-frequent itemset(s)")
+
+    logger.debug("Build up tidsets of 1-frequent items")
+    with metrics.phase("declat.build_tidsets"):
+        tidsets = build_tidsets(encoded_transactions, len(items))
+    metrics.record("declat.tidset_size", sum(item_supports))
+
+    frequent_itemset: Dict[Tuple[int], int] = {
+        (item_id,): support_count
+        for item_id, support_count in enumerate(item_supports)
+    }
+
+    logger.debug("Find frequent itemset by dEclat")
+    with metrics.phase("declat.mine"):
+        # 2-itemsets switch from tidsets to diffsets, d(XY) = t(X) - t(Y)
+        # Items are extended in ascending order of support, so that t(Y) is the larger tidset and diffsets stay small
+        item_order = list(reversed(range(len(items))))
+        for order_i, item_i in enumerate(item_order):
+            if max_length is not None and max_length < 2:
+                break
+
+            equivalence_class: List[Tuple[Tuple[int], Set[int], int]] = []
+
+            for item_j in item_order[order_i + 1:]:
+                diffset = tidsets[item_i] - tidsets[item_j]
+                support_count = item_supports[item_i] - len(diffset)
+                if support_count >= minsup_count:
+                    equivalence_class.append(((item_i, item_j), diffset, support_count))
+
+            # Tidset of item_i is not needed anymore, release it for memory
+            tidsets[item_i] = None
+
+            if metrics.is_enabled():
+                metrics.increment("declat.diffset_size", sum(len(diffset) for _, diffset, _ in equivalence_class))
+
+            for itemset, _, support_count in equivalence_class:
+                frequent_itemset[itemset] = support_count
+
+            if len(equivalence_class) > 1:
+                mine_equivalence_class(equivalence_class, minsup_count, frequent_itemset, max_length)
+
+    k_frequent_itemset = transaction_encoder.decode_k_frequent_itemset(frequent_itemset, items)
+    for k_value in k_frequent_itemset:
+        logger.debug(f"Found {len(k_frequent_itemset[k_value])} {k_value}-frequent itemset(s)")
+        metrics.record(f"declat.level_{k_value}.frequent", len(k_frequent_itemset[k_value]))
+
+    return k_frequent_itemset
@@ -5,6 +5,9 @@ from typing import Dict, List, Tuple, Any
 
 from loguru import logger
 
+from utils import metrics
+from utils.constraints import MiningConstraints, filter_transactions
+
 
 class FPTreeNode:
     # Attribute of FPTreeNode
@@ -68,101 +71,115 @@ def fp_tree_link_parallel(
 def find_frequent_itemset(
     transactions: List[List[Any]],
     minsup: float,
+    constraints: MiningConstraints = None,
 ):
     # Evaluate minimum support count
     minsup_count = round(minsup * len(transactions))
     logger.debug(f"Minimum support count: {minsup_count}")
 
+    # Drop items which are not allowed, they never enter FP-Tree and its projections
+    transactions = filter_transactions(transactions, constraints)
+    max_length = constraints.max_length if constraints is not None else None
+
     logger.debug("Find 1-frequent itemset by scanning transaction")
     candidate_itemset: Dict[Any, int] = {}  # Record candidate itemset with support count
 
-    # Collect all 1-candidate itemsets by scanning transactions
-    for transaction in transactions:
-        for item in transaction:
-            candidate_itemset[item] = (
-                candidate_itemset[item] + 1
-                if item in candidate_itemset
-                else 1
-            )
+    with metrics.phase("fp_growth.frequent_1"):
+        # Collect all 1-candidate itemsets by scanning transactions
+        for transaction in transactions:
+            for item in transaction:
+                candidate_itemset[item] = (
+                    candidate_itemset[item] + 1
+                    if item in candidate_itemset
+                    else 1
+                )
 
-    # Filter 1-frequent itemset by minimum support and sort items
-    frequent_1_itemset: Dict[Any, int] = {
-        itemset: support_count
-        for itemset, support_count in sorted(
-            candidate_itemset.items(),
-            key=lambda item: item[1],
-            reverse=True,
-        )
-        if candidate_itemset[itemset] >= minsup_count
-    }
+        # Filter 1-frequent itemset by minimum support and sort items
+        frequent_1_itemset: Dict[Any, int] = {
+            itemset: support_count
+            for itemset, support_count in sorted(
+                candidate_itemset.items(),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+            if candidate_itemset[itemset] >= minsup_count
+        }
 
     # Print count of 1-frequent itemset
     logger.debug(f"Found {len(frequent_1_itemset)} 1-frequent itemset")
+    metrics.record("fp_growth.level_1.candidates", len(candidate_itemset))
+    metrics.record("fp_growth.level_1.frequent", len(frequent_1_itemset))
 
     # Scan Transactions again to construct ordered transactions without items not in 1-frequent itemset
     logger.debug("Construct ordered transaction")
-    ordered_transactions: List[Any] = []
-    for transaction in transactions:
-        ordered_transaction = []
+    with metrics.phase("fp_growth.build_tree"):
+        ordered_transactions: List[Any] = []
+        for transaction in transactions:
+            ordered_transaction = []
+
+            # Scan 1-frequent itemset in order
+            for itemset_1 in frequent_1_itemset:
+                # Scan Item in a Transaction
+                for item in transaction:
+                    # Item matches 1-frequent itemset
+                    if item == itemset_1:
+                        ordered_transaction.append(item)  # Append item by frequent_1_itemset order
+                        continue                          # Not possible to find duplicated value, continue.
+
+            # Add to ordered_transactions if length of ordered_transaction is not zero
+            if len(ordered_transaction) > 0:
+                ordered_transactions.append(ordered_transaction)
+
+        # Scan ordered_transactions to Construct FP-Tree
+        logger.debug("Build Up FP-Tree with 1-frequent pattern link")
+        fp_tree_root = FPTreeNode(None)
+        fp_tree_link: Dict[Any, FPTreeNode] = {
+            itemset_1: None
+            for itemset_1 in frequent_1_itemset
+        }
+        fp_tree_node_count = 1
 
-        # Scan 1-frequent itemset in order
-        for itemset_1 in frequent_1_itemset:
-            # Scan Item in a Transaction
-            for item in transaction:
-                # Item matches 1-frequent itemset
-                if item == itemset_1:
-                    ordered_transaction.append(item)  # Append item by frequent_1_itemset order
-                    continue                          # Not possible to find duplicated value, continue.
-
-        # Add to ordered_transactions if length of ordered_transaction is not zero
-        if len(ordered_transaction) > 0:
-            ordered_transactions.append(ordered_transaction)
-
-    # Scan ordered_transactions to Construct FP-Tree
-    logger.debug("Build Up FP-Tree with 1-frequent pattern link")
-    fp_tree_root = FPTreeNode(None)
-    fp_tree_link: Dict[Any, FPTreeNode] = {
-        itemset_1: None
-        for itemset_1 in frequent_1_itemset
-    }
+        for transaction in ordered_transactions:
+            traverse_node = fp_tree_root     # Point to root node of FP-Tree while scanning new transaction
 
-    for transaction in ordered_transactions:
-        traverse_node = fp_tree_root     # Point to root node of FP-Tree while scanning new transaction
+            # Scan items in transaction
+            for item in transaction:
+                scan_next = False
 
-        # Scan items in transaction
-        for item in transaction:
-            scan_next = False
+                # Traverse child of node
+                for child_node in traverse_node.children:
 
-            # Traverse child of node
-            for child_node in traverse_node.children:
+                    # Check if pattern of node matches the item of transaction
+                    if child_node.data == item:
+                        # Frequent Pattern Matched, count once.
+                        child_node.fp_count += 1
 
-                # Check if pattern of node matches the item of transaction
-                if child_node.data == item:
-                    # Frequent Pattern Matched, count once.
-                    child_node.fp_count += 1
+                        # Replace traversing node to created_node
+                        traverse_node = child_node
 
-                    # Replace traversing node to created_node
-                    traverse_node = child_node
+                        # Set Flag to Scan Next Item
+                        scan_next = True
 
-                    # Set Flag to Scan Next Item
-                    scan_next = True
+                if scan_next:
+                    continue
 
-            if scan_next:
-                continue
+                # No any children match current item, create new node
+                created_node = FPTreeNode(item)
+                fp_tree_node_count += 1
 
-            # No any children match current item, create new node
-            created_node = FPTreeNode(item)
+                # Don`t forget to count current node as a frequent pattern
+                created_node.fp_count = 1
 
-            # Don`t forget to count current node as a frequent pattern
-            created_node.fp_count = 1
+                # Append to traverse_node
+                traverse_node.children.append(created_node)
 
-            # Append to traverse_node
-            traverse_node.children.append(created_node)
+                # Replace traversing node to created_node
+                traverse_node = created_node
 
-            # Replace traversing node to created_node
-            traverse_node = created_node
+        fp_tree_link_parallel(fp_tree_root, fp_tree_link)
 
-    fp_tree_link_parallel(fp_tree_root, fp_tree_link)
+    metrics.record("fp_growth.ordered_transactions", len(ordered_transactions))
+    metrics.record("fp_growth.fp_tree_nodes", fp_tree_node_count)
 
     # Print Tree
     # print_fptree(fp_tree_root)
@@ -171,29 +188,35 @@ def find_frequent_itemset(
     logger.debug("Use BFS on FP-Tree to Find All Frequent Pattern Prefixes")
     # Ref: https://favtutor.com/blogs/breadth-first-search-python
 
-    fp_prefixes: Dict[Any, Dict[Any, FPTreeNode]] = {item: [] for item in frequent_1_itemset}
-    bfs_queue: List[Tuple[FPTreeNode, Tuple]] = [(fp_tree_root, tuple())]
+    with metrics.phase("fp_growth.prefix_paths"):
+        fp_prefixes: Dict[Any, Dict[Any, FPTreeNode]] = {item: [] for item in frequent_1_itemset}
+        bfs_queue: List[Tuple[FPTreeNode, Tuple]] = [(fp_tree_root, tuple())]
 
-    while len(bfs_queue) > 0:
-        # Traverse Node
-        traverse_node, traverse_prefix_nodes = bfs_queue.pop(0)
+        while len(bfs_queue) > 0:
+            # Traverse Node
+            traverse_node, traverse_prefix_nodes = bfs_queue.pop(0)
 
-        # Add to fp_prefixes if length of pattern is bigger than 1
-        if len(traverse_prefix_nodes) > 0:
-            fp_prefixes[traverse_node.data].append(
-                (traverse_prefix_nodes, traverse_node.fp_count)
-            )
+            # Add to fp_prefixes if length of pattern is bigger than 1
+            if len(traverse_prefix_nodes) > 0:
+                fp_prefixes[traverse_node.data].append(
+                    (traverse_prefix_nodes, traverse_node.fp_count)
+                )
 
-        # Add nodes to queue for traversing in future
-        bfs_queue += [
-            (
-                child,
-                traverse_prefix_nodes + (traverse_node,)
-                if traverse_node.data is not None
-                else tuple(),
-            )
-            for child in traverse_node.children
-        ]
+            # Add nodes to queue for traversing in future
+            bfs_queue += [
+                (
+                    child,
+                    traverse_prefix_nodes + (traverse_node,)
+                    if traverse_node.data is not None
+                    else tuple(),
+                )
+                for child in traverse_node.children
+            ]
+
+    if metrics.is_enabled():
+        # Size of conditional pattern base (count of prefix paths) for each 1-frequent item
+        metrics.record("fp_growth.conditional_base_paths", sum(len(paths) for paths in fp_prefixes.values()))
+        metrics.record("fp_growth.conditional_base_max_paths", max(map(len, fp_prefixes.values()), default=0))
 
     # for itemset in reversed(fp_prefixes):
     #     print(f"{itemset}")
@@ -204,148 +227,160 @@ def find_frequent_itemset(
 
     # Build up conditional FP-Tree (Traverse in reversed order)
     logger.debug("Build up conditional FP-Tree")
-    cond_fptrees: Dict[Any, Tuple[FPTreeNode, Dict[Any, FPTreeNode]]] = {}
-    for itemset in reversed(fp_prefixes):
-        suffix_support_count = frequent_1_itemset[itemset]
-        # print(f"{itemset} -> Support Count {suffix_support_count}")
-
-        # Traverse each prefix in the list of prefixes for specific itemset to build up Conditional FP-Tree
-        cond_fp_tree_root: FPTreeNode = FPTreeNode(None)
-        cond_fp_tree_link: Dict[Any, FPTreeNode] = {}
-
-        # Scan all prefix nodes to find out all possible items
-        for prefix_nodes, _ in fp_prefixes[itemset]:
-            for prefix_node in prefix_nodes:
-                cond_fp_tree_link[prefix_node.data] = None
-
-        # Sort by frequent 1 itemset order
-        # TODO: integrate sorting function into a independent function
-        index_map = {v: i for i, v in enumerate(frequent_1_itemset)}
-        cond_fp_tree_link = {
-            k: v for k, v in
-            sorted(cond_fp_tree_link.items(), key=lambda pair: index_map[pair[0]])
-        }
+    with metrics.phase("fp_growth.conditional_tree"):
+        cond_fptrees: Dict[Any, Tuple[FPTreeNode, Dict[Any, FPTreeNode]]] = {}
+        cond_fp_tree_node_count = 0
+        for itemset in reversed(fp_prefixes):
+            suffix_support_count = frequent_1_itemset[itemset]
+            # print(f"{itemset} -> Support Count {suffix_support_count}")
+
+            # Traverse each prefix in the list of prefixes for specific itemset to build up Conditional FP-Tree
+            cond_fp_tree_root: FPTreeNode = FPTreeNode(None)
+            cond_fp_tree_link: Dict[Any, FPTreeNode] = {}
+
+            # Scan all prefix nodes to find out all possible items
+            for prefix_nodes, _ in fp_prefixes[itemset]:
+                for prefix_node in prefix_nodes:
+                    cond_fp_tree_link[prefix_node.data] = None
+
+            # Sort by frequent 1 itemset order
+            # TODO: integrate sorting function into a independent function
+            index_map = {v: i for i, v in enumerate(frequent_1_itemset)}
+            cond_fp_tree_link = {
+                k: v for k, v in
+                sorted(cond_fp_tree_link.items(), key=lambda pair: index_map[pair[0]])
+            }
 
-        # Build Condition FP Tree
-        for prefix_nodes, prefix_support_count in fp_prefixes[itemset]:
-            # print([node.data for node in prefix_nodes])
+            # Build Condition FP Tree
+            for prefix_nodes, prefix_support_count in fp_prefixes[itemset]:
+                # print([node.data for node in prefix_nodes])
 
-            traverse_node: FPTreeNode = cond_fp_tree_root
-            for prefix_node in prefix_nodes:
-                scan_next = False
+                traverse_node: FPTreeNode = cond_fp_tree_root
+                for prefix_node in prefix_nodes:
+                    scan_next = False
 
-                # Check if pattern of node matches the data of prefix_node
-                for child_node in traverse_node.children:
-                    if prefix_node.data == child_node.data:
-                        # Frequent Pattern Matched, count once.
-                        # print(f"Prefix matched {prefix_node.data}")
-                        child_node.fp_count += prefix_support_count
+                    # Check if pattern of node matches the data of prefix_node
+                    for child_node in traverse_node.children:
+                        if prefix_node.data == child_node.data:
+                            # Frequent Pattern Matched, count once.
+                            # print(f"Prefix matched {prefix_node.data}")
+                            child_node.fp_count += prefix_support_count
 
-                        # Replace traversing node to specific child node
-                        traverse_node = child_node
+                            # Replace traversing node to specific child node
+                            traverse_node = child_node
 
-                        scan_next = True
-                        break
+                            scan_next = True
+                            break
 
-                if scan_next:
-                    continue
+                    if scan_next:
+                        continue
 
-                # No any children match current prefix_node.data, create new node
-                created_node = FPTreeNode(prefix_node.data)
-                # print(f"Create node {prefix_node.data}")
+                    # No any children match current prefix_node.data, create new node
+                    created_node = FPTreeNode(prefix_node.data)
+                    cond_fp_tree_node_count += 1
+                    # print(f"Create node {prefix_node.data}")
 
-                # Don`t forget to count current node as a frequent pattern
-                created_node.fp_count = prefix_support_count
+                    # Don`t forget to count current node as a frequent pattern
+                    created_node.fp_count = prefix_support_count
 
-                # Append to traverse_node
-                traverse_node.children.append(created_node)
+                    # Append to traverse_node
+                    traverse_node.children.append(created_node)
 
-                # Replace traversing node to created_node
-                traverse_node = created_node
-                # print_fptree(cond_fp_tree_root)
+                    # Replace traversing node to created_node
+                    traverse_node = created_node
+                    # print_fptree(cond_fp_tree_root)
+
+            fp_tree_link_parallel(cond_fp_tree_root, cond_fp_tree_link)
+            # print("Final Tree:")
+            # print_fptree(cond_fp_tree_root)
+            # print_fplink(cond_fp_tree_link)
 
-        fp_tree_link_parallel(cond_fp_tree_root, cond_fp_tree_link)
-        # print("Final Tree:")
-        # print_fptree(cond_fp_tree_root)
-        # print_fplink(cond_fp_tree_link)
+            # print("------------")
+            cond_fptrees[itemset] = (cond_fp_tree_root, cond_fp_tree_link)
 
-        # print("------------")
-        cond_fptrees[itemset] = (cond_fp_tree_root, cond_fp_tree_link)
+    metrics.record("fp_growth.conditional_fp_trees", len(cond_fptrees))
+    metrics.record("fp_growth.conditional_fp_tree_nodes", cond_fp_tree_node_count)
 
     # Build up frequent itemset by FP-Tree Traversal (Traverse in reversed order)
     logger.debug("Generate frequent itemset by conditional FP-Tree traversal")
-    frequent_itemset: Dict[Tuple[Any], int] = dict()
-    for suffix in cond_fptrees:
-        # print(f"Suffix: {suffix}")
-        fp_tree_root, fp_tree_link = cond_fptrees[suffix]
-
-        valid_prefixes_component: Dict[Any, int] = dict()
-        # Horizontal Scanning
-        for itemset in fp_tree_link:
-            traverse_node = fp_tree_link[itemset]
-            total_support = 0
-
-            while traverse_node is not None:
-                total_support += traverse_node.fp_count
-
-                traverse_node = traverse_node.pnode
-
-            if total_support >= minsup_count:
-                valid_prefixes_component[itemset] = total_support
-            # print(f"Parallel Prefix: {itemset} -> {total_support} {'(v)' if total_support >= minsup_count else ''}")
-
-        # Tree Scanning (by BFS)
-        # print_fptree(fp_tree_root)
-        traverse_node = fp_tree_root
-        bfs_queue: List[Tuple[FPTreeNode, Tuple]] = [(fp_tree_root, tuple())]
-        bfs_valid_prefixes: Dict[Tuple[Any], int] = {}
-        while len(bfs_queue) > 0:
-            traverse_node, traverse_prefix_nodes = bfs_queue.pop(0)
-
-            # Add to fp_prefixes if length of pattern is bigger than 2
-            if len(traverse_prefix_nodes) > 1:
-                bfs_prefix = tuple([node.data for node in traverse_prefix_nodes])
-                bfs_prefix_support = min([node.fp_count for node in traverse_prefix_nodes])
-
-                # print(f"BFS Prefix: {bfs_prefix} -> {bfs_prefix_support} {'(v)' if bfs_prefix_support >= minsup_count else ''} ")
-
-                bfs_valid_prefixes[bfs_prefix] = bfs_prefix_support
-
-            # Add nodes to queue for traversing in future
-            bfs_queue += [
-                (
-                    child,
-                    traverse_prefix_nodes + (child,)
-                    if traverse_node.data is not None
-                    else (child,),
-                )
-                for child in traverse_node.children
-            ]
-
-        # for component in bfs_valid_prefixes:
-        #     print(component)
-
-        valid_prefixes = list(
-            {
-                tuple(set(result))
-                for result in cartesian_product(
-                    tuple(valid_prefixes_component),
-                    repeat=len(valid_prefixes_component)
-                )
-            }
-        )
+    with metrics.phase("fp_growth.generate"):
+        frequent_itemset: Dict[Tuple[Any], int] = dict()
+        for suffix in cond_fptrees:
+            # print(f"Suffix: {suffix}")
+            fp_tree_root, fp_tree_link = cond_fptrees[suffix]
+
+            valid_prefixes_component: Dict[Any, int] = dict()
+            # Horizontal Scanning
+            for itemset in fp_tree_link:
+                traverse_node = fp_tree_link[itemset]
+                total_support = 0
+
+                while traverse_node is not None:
+                    total_support += traverse_node.fp_count
+
+                    traverse_node = traverse_node.pnode
+
+                if total_support >= minsup_count:
+                    valid_prefixes_component[itemset] = total_support
+                # print(f"Parallel Prefix: {itemset} -> {total_support} {'(v)' if total_support >= minsup_count else ''}")
+
+            # Tree Scanning (by BFS)
+            # print_fptree(fp_tree_root)
+            traverse_node = fp_tree_root
+            bfs_queue: List[Tuple[FPTreeNode, Tuple]] = [(fp_tree_root, tuple())]
+            bfs_valid_prefixes: Dict[Tuple[Any], int] = {}
+            while len(bfs_queue) > 0:
+                traverse_node, traverse_prefix_nodes = bfs_queue.pop(0)
+
+                # Add to fp_prefixes if length of pattern is bigger than 2
+                if len(traverse_prefix_nodes) > 1:
+                    bfs_prefix = tuple([node.data for node in traverse_prefix_nodes])
+                    bfs_prefix_support = min([node.fp_count for node in traverse_prefix_nodes])
+
+                    # print(f"BFS Prefix: {bfs_prefix} -> {bfs_prefix_support} {'(v)' if bfs_prefix_support >= minsup_count else ''} ")
+
+                    bfs_valid_prefixes[bfs_prefix] = bfs_prefix_support
+
+                # Add nodes to queue for traversing in future
+                bfs_queue += [
+                    (
+                        child,
+                        traverse_prefix_nodes + (child,)
+                        if traverse_node.data is not None
+                        else (child,),
+                    )
+                    for child in traverse_node.children
+                ]
+
+            # for component in bfs_valid_prefixes:
+            #     print(component)
+
+            # Prefixes longer than (maximum length - 1) are never generated
+            valid_prefixes = list(
+                {
+                    tuple(set(result))
+                    for result in cartesian_product(
+                        tuple(valid_prefixes_component),
+                        repeat=(
+                            len(valid_prefixes_component)
+                            if max_length is None
+                            else min(len(valid_prefixes_component), max_length - 1)
+                        )
+                    )
+                }
+            )
 
-        for prefix in valid_prefixes:
-            if prefix == tuple():
-                break
+            for prefix in valid_prefixes:
+                if prefix == tuple():
+                    break
 
-            final_support = min([valid_prefixes_component[item] for item in list(prefix)])
+                final_support = min([valid_prefixes_component[item] for item in list(prefix)])
 
-            if len(prefix) > 1 and prefix in bfs_valid_prefixes:
-                final_support = min(final_support, bfs_valid_prefixes[prefix])
+                if len(prefix) > 1 and prefix in bfs_valid_prefixes:
+                    final_support = min(final_support, bfs_valid_prefixes[prefix])
 
-            complete_itemset = prefix + (suffix,)
-            frequent_itemset[complete_itemset] = final_support
+                complete_itemset = prefix + (suffix,)
+                frequent_itemset[complete_itemset] = final_support
 
         # print("----------------------------")
     # print(frequent_itemset)
@@ -362,6 +397,11 @@ def find_frequent_itemset(
 
     k = 2
     while True:
+        # Keep the trailing empty level after maximum length
+        if max_length is not None and k > max_length:
+            k_frequent_itemset[k] = dict()
+            break
+
         k_frequent_itemset[k] = {
             tuple(sorted(itemset)): frequent_itemset[itemset]
             for itemset in frequent_itemset
@@ -369,6 +409,7 @@ def find_frequent_itemset(
         }
 
         logger.debug(f"Found {len(k_frequent_itemset[k])} {k}-frequent itemset")
+        metrics.record(f"fp_growth.level_{k}.frequent", len(k_frequent_itemset[k]))
 
         if len(k_frequent_itemset[k]) == 0:
             break
@@ -0,0 +1,187 @@
+import sys
+from itertools import combinations
+from math import comb
+from typing import Any, Dict, List, Set, Tuple
+
+from loguru import logger
+
+from algorithms import vertical
+from utils import metrics, transaction_encoder
+from utils.constraints import MiningConstraints, filter_transactions
+
+# Datasets whose density (average 1-frequent items per transaction / count of 1-frequent items) reaches this value
+# are mined by vertical bitmaps from the 2nd level
+VERTICAL_DENSITY = 0.1
+
+# Relative cost of operations in cost model of each level, roughly measured on CPython
+SUBSET_COST = 1.0           # Enumerate a k-subset of a transaction and look it up in candidates
+BITMAP_OP_COST = 1.0        # Python overhead of a bitmap intersection and popcount
+BITMAP_WORD_COST = 0.02     # Intersection and popcount of a 64-bit word of bitmap
+
+
+def dataset_statistics(
+    transactions: List[List[Any]],
+    encoded_transactions: List[Tuple[int]],
+    item_support: Dict[Any, int],
+    frequent_item_count: int,
+) -> Dict[str, float]:
+    """Evaluate cheap dataset statistics after the first pass
+
+    Args:
+        transactions (List[List[Any]]): List of Transactions.
+        encoded_transactions (List[Tuple[int]]): output of transaction_encoder.encode_transactions()
+        item_support (Dict[Any, int]): output of transaction_encoder.count_items()
+        frequent_item_count (int): count of 1-frequent items
+
+    Returns:
+        Dict[str, float]: dataset statistics
+    """
+    transaction_count = max(1, len(transactions))
+    avg_frequent_length = sum(map(len, encoded_transactions)) / transaction_count
+
+    return {
+        "transactions": len(transactions),
+        "items": len(item_support),
+        "frequent_items": frequent_item_count,
+        "avg_transaction_length": sum(item_support.values()) / transaction_count,
+        "avg_frequent_transaction_length": avg_frequent_length,
+        "density": avg_frequent_length / frequent_item_count if frequent_item_count > 0 else 0.0,
+    }
+
+
+def candidate_join(frequent_itemsets: List[Tuple[int]], length: int) -> Set[Tuple[int]]:
+    """Generate k-candidate itemsets by joining (k-1)-frequent itemsets with same prefix and pruning
+
+    Args:
+        frequent_itemsets (List[Tuple[int]]): sorted (k-1)-frequent itemsets of item IDs
+        length (int): k
+
+    Returns:
+        Set[Tuple[int]]: k-candidate itemsets whose (k-1)-subsets are all frequent
+    """
+    frequent_lookup = set(frequent_itemsets)
+    prefix_groups: Dict[Tuple[int], List[int]] = {}
+    for itemset in frequent_itemsets:
+        prefix_groups.setdefault(itemset[:-1], []).append(itemset[-1])
+
+    candidate_itemsets: Set[Tuple[int]] = set()
+    for prefix, last_items in prefix_groups.items():
+        for i, item_i in enumerate(last_items):
+            for item_j in last_items[i + 1:]:
+                candidate = prefix + (item_i, item_j)
+                # Prune - all (k-1)-subsets must be frequent, subsets without item_i or item_j are joined ones
+                if all(
+                    candidate[:drop] + candidate[drop + 1:] in frequent_lookup
+                    for drop in range(length - 2)
+                ):
+                    candidate_itemsets.add(candidate)
+
+    return candidate_itemsets
+
+
+@logger.catch(onerror=lambda _: sys.exit(1))
+def find_frequent_itemset(
+    transactions: List[List[Any]],
+    minsup: float,
+    constraints: MiningConstraints = None,
+) -> Dict[int, Dict[Tuple[Any], int]]:
+    """Find frequent itemset by level-wise Apriori and vertical bitmaps, selected by dataset statistics and cost
+
+    Shallow levels of sparse datasets are counted level-wise by enumerating k-subsets of transactions.
+    Once a level is estimated to be cheaper by bitmap intersections, or the dataset is dense, the remaining
+    levels are mined by Eclat on vertical bitmaps starting from the frequent itemsets found so far.
+
+    Args:
+        transactions (List[List[Any]]): List of Transactions. For each transaction, it stores items in List format.
+        minsup (float): minimum support for finding frequent itemset
+        constraints (MiningConstraints, optional): item filters and maximum length of itemsets. Defaults to None.
+
+    Returns:
+        Dict[int, Dict[Tuple[Any], int]]: k-frequent itemset
+    """
+    # Evaluate minimum support count
+    minsup_count = round(minsup * len(transactions))
+    max_length = constraints.max_length if constraints is not None else None
+
+    # Drop items which are not allowed, they are neither counted nor get a bitmap
+    transactions = filter_transactions(transactions, constraints)
+
+    logger.debug("Find 1-frequent itemset by scanning transaction")
+    with metrics.phase("hybrid.level_1"):
+        item_support = transaction_encoder.count_items(transactions)
+        encoded_transactions, items, item_supports = transaction_encoder.encode_transactions(
+            transactions,
+            minsup_count,
+            item_support,
+        )
+    logger.debug(f"Found {len(items)} 1-frequent itemset(s)")
+
+    statistics = dataset_statistics(transactions, encoded_transactions, item_support, len(items))
+    logger.debug(f"Dataset statistics: {statistics}")
+    for name, value in statistics.items():
+        metrics.record(f"hybrid.{name}", value)
+
+    frequent_itemset: Dict[Tuple[int], int] = {
+        (item_id,): support_count
+        for item_id, support_count in enumerate(item_supports)
+    }
+    frequent_itemsets = sorted(frequent_itemset)
+    bitmap_word_count = (len(transactions) + 63) // 64
+
+    k_value = 2
+    while len(frequent_itemsets) > 1 and (max_length is None or k_value <= max_length):
+        candidate_itemsets = candidate_join(frequent_itemsets, k_value)
+        if len(candidate_itemsets) == 0:
+            break
+
+        # Keep items which appear in (k-1)-frequent itemsets, others can not be a part of k-candidate itemsets
+        level_items = {item_id for itemset in frequent_itemsets for item_id in itemset}
+        level_transactions = [
+            level_transaction
+            for level_transaction in (
+                tuple(item_id for item_id in transaction if item_id in level_items)
+                for transaction in encoded_transactions
+            )
+            if len(level_transaction) >= k_value
+        ]
+
+        # Cost model - enumerating k-subsets of transactions vs intersecting bitmaps of candidates
+        subset_cost = SUBSET_COST * sum(comb(len(transaction), k_value) for transaction in level_transactions)
+        bitmap_cost = len(candidate_itemsets) * (BITMAP_OP_COST + BITMAP_WORD_COST * bitmap_word_count)
+        is_dense = statistics["density"] >= VERTICAL_DENSITY
+
+        if is_dense or bitmap_cost < subset_cost:
+            logger.debug(
+                f"Switch to vertical bitmaps at level {k_value}, "
+                f"density: {statistics['density']:.3f}, subset cost: {subset_cost:.0f}, bitmap cost: {bitmap_cost:.0f}"
+            )
+            metrics.record("hybrid.vertical_from_level", k_value)
+
+            with metrics.phase("hybrid.vertical"):
+                item_bitmaps = vertical.build_bitmaps(encoded_transactions, len(items))
+                vertical.mine_from_itemsets(frequent_itemset, item_bitmaps, k_value - 1, minsup_count, max_length)
+            break
+
+        logger.debug(f"Find {k_value}-frequent itemset by enumerating subsets of transaction")
+        with metrics.phase(f"hybrid.level_{k_value}"):
+            candidate_support = dict.fromkeys(candidate_itemsets, 0)
+            for transaction in level_transactions:
+                for subset in combinations(transaction, k_value):
+                    if subset in candidate_support:
+                        candidate_support[subset] += 1
+
+            frequent_itemsets = sorted(
+                itemset
+                for itemset, support_count in candidate_support.items()
+                if support_count >= minsup_count
+            )
+            for itemset in frequent_itemsets:
+                frequent_itemset[itemset] = candidate_support[itemset]
+
+        logger.debug(f"Found {len(frequent_itemsets)} {k_value}-frequent itemset(s)")
+        metrics.record(f"hybrid.level_{k_value}.candidates", len(candidate_itemsets))
+        metrics.record(f"hybrid.level_{k_value}.frequent", len(frequent_itemsets))
+
+        k_value += 1
+
+    return transaction_encoder.decode_k_frequent_itemset(frequent_itemset, items)
@@ -0,0 +1,152 @@
+import sys
+from typing import Any, Dict, List, Tuple
+
+from loguru import logger
+
+from utils import metrics, transaction_encoder
+from utils.constraints import MiningConstraints, filter_transactions
+
+# int.bit_count() is available since Python 3.10
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:
+    def popcount(bitmap: int) -> int:
+        return bin(bitmap).count("1")
+
+
+def build_bitmaps(encoded_transactions: List[Tuple[int]], item_count: int) -> List[int]:
+    """Build vertical representation, bit i of bitmap of an item is set if transaction i contains the item
+
+    Args:
+        encoded_transactions (List[Tuple[int]]): transactions of item IDs
+        item_count (int): count of item IDs
+
+    Returns:
+        List[int]: item ID -> bitmap of transaction IDs
+    """
+    bitmap_bytes = [bytearray((len(encoded_transactions) + 7) // 8) for _ in range(item_count)]
+    for tid, transaction in enumerate(encoded_transactions):
+        byte_index, bit = tid >> 3, 1 << (tid & 7)
+        for item_id in transaction:
+            bitmap_bytes[item_id][byte_index] |= bit
+
+    return [int.from_bytes(item_bitmap, "little") for item_bitmap in bitmap_bytes]
+
+
+def mine_equivalence_class(
+    equivalence_class: List[Tuple[Tuple[int], int, int]],
+    minsup_count: int,
+    frequent_itemset: Dict[Tuple[int], int],
+    max_length: int = None,
+) -> None:
+    """Eclat on bitmaps, extend itemsets sharing the same prefix depth-first
+
+    Args:
+        equivalence_class (List[Tuple[Tuple[int], int, int]]): (itemset, bitmap, support count) of frequent itemsets
+            which differ in the last item only, sorted by the last item
+        minsup_count (int): minimum support count
+        frequent_itemset (Dict[Tuple[int], int]): found itemsets are added into it
+        max_length (int, optional): maximum length of itemsets, None for unlimited. Defaults to None.
+    """
+    # Pruning - Extensions of this class would exceed maximum length
+    if max_length is not None and len(equivalence_class[0][0]) >= max_length:
+        return
+
+    for i, (itemset_i, bitmap_i, _) in enumerate(equivalence_class):
+        child_class: List[Tuple[Tuple[int], int, int]] = []
+
+        for itemset_j, bitmap_j, _ in equivalence_class[i + 1:]:
+            bitmap = bitmap_i & bitmap_j
+            support_count = popcount(bitmap)
+            if support_count >= minsup_count:
+                child_class.append((itemset_i + itemset_j[-1:], bitmap, support_count))
+
+        for itemset, _, support_count in child_class:
+            frequent_itemset[itemset] = support_count
+
+        metrics.increment("vertical.intersections", len(equivalence_class) - i - 1)
+
+        if len(child_class) > 1:
+            mine_equivalence_class(child_class, minsup_count, frequent_itemset, max_length)
+
+
+def mine_from_itemsets(
+    frequent_itemset: Dict[Tuple[int], int],
+    item_bitmaps: List[int],
+    length: int,
+    minsup_count: int,
+    max_length: int = None,
+) -> None:
+    """Continue mining by Eclat from frequent itemsets of a given length, e.g. found by a level-wise miner
+
+    Args:
+        frequent_itemset (Dict[Tuple[int], int]): sorted itemsets of item IDs -> support count, deeper itemsets are added
+        item_bitmaps (List[int]): output of build_bitmaps()
+        length (int): length of itemsets where Eclat starts from
+        minsup_count (int): minimum support count
+        max_length (int, optional): maximum length of itemsets, None for unlimited. Defaults to None.
+    """
+    # Group itemsets by prefix into equivalence classes
+    equivalence_classes: Dict[Tuple[int], List[Tuple[Tuple[int], int, int]]] = {}
+    for itemset in sorted(itemset for itemset in frequent_itemset if len(itemset) == length):
+        bitmap = item_bitmaps[itemset[0]]
+        for item_id in itemset[1:]:
+            bitmap &= item_bitmaps[item_id]
+        equivalence_classes.setdefault(itemset[:-1], []).append((itemset, bitmap, frequent_itemset[itemset]))
+
+    for equivalence_class in equivalence_classes.values():
+        if len(equivalence_class) > 1:
+            mine_equivalence_class(equivalence_class, minsup_count, frequent_itemset, max_length)
+
+
+@logger.catch(onerror=lambda _: sys.exit(1))
+def find_frequent_itemset(
+    transactions: List[List[Any]],
+    minsup: float,
+    constraints: MiningConstraints = None,
+) -> Dict[int, Dict[Tuple[Any], int]]:
+    """Find frequent itemset by Eclat on vertical bitmaps
+
+    Args:
+        transactions (List[List[Any]]): List of Transactions. For each transaction, it stores items in List format.
+        minsup (float): minimum support for finding frequent itemset
+        constraints (MiningConstraints, optional): item filters and maximum length of itemsets. Defaults to None.
+
+    Returns:
+        Dict[int, Dict[Tuple[Any], int]]: k-frequent itemset
+    """
+    # Evaluate minimum support count
+    minsup_count = round(minsup * len(transactions))
+
+    # Drop items which are not allowed, they never get a bitmap
+    transactions = filter_transactions(transactions, constraints)
+
+    logger.debug("Find 1-frequent itemset by scanning transaction")
+    with metrics.phase("vertical.encode"):
+        encoded_transactions, items, item_supports = transaction_encoder.encode_transactions(transactions, minsup_count)
+    logger.debug(f"Found {len(items)} 1-frequent itemset(s)")
+
+    logger.debug("Build up bitmaps of 1-frequent items")
+    with metrics.phase("vertical.build_bitmaps"):
+        item_bitmaps = build_bitmaps(encoded_transactions, len(items))
+
+    logger.debug("Find frequent itemset by Eclat")
+    frequent_itemset: Dict[Tuple[int], int] = {
+        (item_id,): support_count
+        for item_id, support_count in enumerate(item_supports)
+    }
+    with metrics.phase("vertical.eclat"):
+        mine_from_itemsets(
+            frequent_itemset,
+            item_bitmaps,
+            1,
+            minsup_count,
+            constraints.max_length if constraints is not None else None,
+        )
+
+    k_frequent_itemset = transaction_encoder.decode_k_frequent_itemset(frequent_itemset, items)
+    for k_value in k_frequent_itemset:
+        logger.debug(f"Found {len(k_frequent_itemset[k_value])} {k_value}-frequent itemset(s)")
+        metrics.record(f"vertical.level_{k_value}.frequent", len(k_frequent_itemset[k_value]))
+
+    return k_frequent_itemset
@@ -0,0 +1,217 @@
+# Python Standard Module Imprt
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Tuple
+
+# External Module Import
+from loguru import logger
+
+# Repo-Defined Module Import
+from main import ALGORITHMS, DEFAULT_ALGORITHMS, MINCONF, MINSUP, mkdir_conditional, parse_dataset
+from utils import data_reader, output_writer, result_cache, threshold_sweep
+from utils.shared_transactions import SharedTransactions
+
+# Adjust this parameter in needed
+WORKERS = None      # None for os.cpu_count()
+
+# Shared datasets, assigned once per worker process by _init_worker()
+_shared_datasets: Dict[str, SharedTransactions] = {}
+
+# (dataset name, transactions) decoded last, jobs of the same dataset are scheduled next to each other
+_decoded_dataset: Tuple[str, List[List[Any]]] = (None, None)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Batch association analysis of many datasets over a shared worker pool")
+    parser.add_argument(
+        "-d", "--dataset", nargs="+", required=True,
+        help="dataset(s) in NAME=PATH or PATH format, or directories whose files are datasets",
+    )
+    parser.add_argument("-a", "--algorithm", nargs="+", choices=list(ALGORITHMS), default=DEFAULT_ALGORITHMS)
+    parser.add_argument("-s", "--minsup", nargs="+", type=float, default=[MINSUP])
+    parser.add_argument("-c", "--minconf", nargs="+", type=float, default=[MINCONF])
+    parser.add_argument("-j", "--workers", type=int, default=WORKERS, help="count of worker processes")
+    parser.add_argument("-f", "--output-format", choices=output_writer.OUTPUT_FORMATS, default=output_writer.OUTPUT_FORMATS[0])
+    parser.add_argument("-o", "--output-dir", default="./output")
+    parser.add_argument("--cache-dir", default=result_cache.CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="always mine without the result cache")
+    return parser.parse_args()
+
+
+def expand_datasets(dataset_args: List[str]) -> List[Tuple[str, str]]:
+    """Expand dataset arguments, every file of a directory is a dataset named by its file name
+
+    Args:
+        dataset_args (List[str]): datasets in NAME=PATH or PATH format, or directories
+
+    Returns:
+        List[Tuple[str, str]]: (dataset name, dataset path)
+    """
+    datasets: List[Tuple[str, str]] = []
+    for dataset in dataset_args:
+        if os.path.isdir(dataset):
+            datasets.extend(
+                parse_dataset(os.path.join(dataset, file_name))
+                for file_name in sorted(os.listdir(dataset))
+                if os.path.isfile(os.path.join(dataset, file_name))
+            )
+        else:
+            datasets.append(parse_dataset(dataset))
+
+    dataset_names = [dataset_name for dataset_name, _ in datasets]
+    assert len(set(dataset_names)) == len(dataset_names), "Dataset names must be unique, use NAME=PATH format"
+    return datasets
+
+
+def load_datasets(datasets: List[Tuple[str, str]]) -> Dict[str, SharedTransactions]:
+    """Read each dataset once and place it into shared memory
+
+    Args:
+        datasets (List[Tuple[str, str]]): (dataset name, dataset path)
+
+    Returns:
+        Dict[str, SharedTransactions]: dataset name -> shared transactions, unlinked by the caller
+    """
+    shared_datasets: Dict[str, SharedTransactions] = {}
+    try:
+        for dataset_name, dataset_path in datasets:
+            logger.info(f"{dataset_name} - Read dataset {dataset_path} into shared memory")
+            shared_datasets[dataset_name] = SharedTransactions(data_reader.read_transactions(dataset_path))
+    except BaseException:
+        release_datasets(shared_datasets)
+        raise
+
+    return shared_datasets
+
+
+def release_datasets(shared_datasets: Dict[str, SharedTransactions]) -> None:
+    for shared_transactions in shared_datasets.values():
+        shared_transactions.close()
+        shared_transactions.unlink()
+
+
+def schedule_jobs(
+    shared_datasets: Dict[str, SharedTransactions],
+    algorithms: List[str],
+) -> List[Tuple[str, str]]:
+    """Order (dataset, algorithm) jobs largest first, so that long jobs do not start last and idle the pool
+
+    Each job mines once at the lowest minsup and slices the other minsups from it, as main.py does.
+
+    Args:
+        shared_datasets (Dict[str, SharedTransactions]): output of load_datasets()
+        algorithms (List[str]): keys of ALGORITHMS
+
+    Returns:
+        List[Tuple[str, str]]: (dataset name, algorithm) ordered by count of items in dataset
+    """
+    return sorted(
+        (
+            (dataset_name, algorithm)
+            for dataset_name in shared_datasets
+            for algorithm in algorithms
+        ),
+        key=lambda job: (-shared_datasets[job[0]].item_count, job[0]),
+    )
+
+
+def _init_worker(shared_datasets: Dict[str, SharedTransactions]) -> None:
+    global _shared_datasets
+    _shared_datasets = shared_datasets
+
+
+def _dataset_transactions(dataset_name: str) -> List[List[Any]]:
+    global _decoded_dataset
+    if _decoded_dataset[0] != dataset_name:
+        # Drop the previous dataset first, only one decoded dataset is kept per worker
+        _decoded_dataset = (None, None)
+        _decoded_dataset = (dataset_name, _shared_datasets[dataset_name].transactions())
+    return _decoded_dataset[1]
+
+
+def _run_job(
+    dataset_name: str,
+    algorithm: str,
+    minsup_grid: List[float],
+    minconf_grid: List[float],
+    output_dir: str,
+    output_format: str,
+    cache_dir: str,
+) -> List[Dict[str, Any]]:
+    """Run a job in the worker and write its output files there, named as main.py does
+
+    Only counts and output paths are returned, itemsets and rules are never sent back to the parent.
+
+    Args:
+        dataset_name (str): dataset name
+        algorithm (str): key of ALGORITHMS
+        minsup_grid (List[float]): minimum supports
+        minconf_grid (List[float]): minimum confidences
+        output_dir (str): output directory
+        output_format (str): output format
+        cache_dir (str): cache directory, None for disabling the result cache
+
+    Returns:
+        List[Dict[str, Any]]: itemset count, rule count and output files for each (minsup, minconf) pair
+    """
+    find_frequent_itemset, algorithm_tag = ALGORITHMS[algorithm]
+    job_result = threshold_sweep.sweep_thresholds(
+        find_frequent_itemset,
+        _dataset_transactions(dataset_name),
+        minsup_grid,
+        minconf_grid,
+        algorithm,
+        os.path.join(output_dir, f"{dataset_name}_{algorithm_tag}_APR"),
+        workers=1,
+        cache_dir=cache_dir,
+        output_format=output_format,
+    )
+
+    return [
+        {"dataset": dataset_name, "algorithm": algorithm, **point}
+        for point in job_result
+    ]
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    mkdir_conditional(args.output_dir)
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    shared_datasets = load_datasets(expand_datasets(args.dataset))
+    try:
+        jobs = schedule_jobs(shared_datasets, args.algorithm)
+        logger.info(f"Run {len(jobs)} job(s) of {len(shared_datasets)} dataset(s) with {args.workers or os.cpu_count()} worker(s)")
+
+        with ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=_init_worker,
+            initargs=(shared_datasets,),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _run_job,
+                    *job,
+                    args.minsup,
+                    args.minconf,
+                    args.output_dir,
+                    args.output_format,
+                    cache_dir,
+                )
+                for job in jobs
+            ]
+
+            # Workers write output files, the parent only reports counts as jobs finish
+            for finished_count, future in enumerate(as_completed(futures), 1):
+                for point in future.result():
+                    logger.info(
+                        f"[{finished_count}/{len(jobs)}] {point['dataset']} - {point['algorithm']}, "
+                        f"minsup: {point['minsup']}, minconf: {point['minconf']} -> "
+                        f"{point['itemset_count']} frequent itemset(s), {point['rule_count']} association rule(s)"
+                    )
+    finally:
+        release_datasets(shared_datasets)
+
+    logger.success("End of the batch association analysis")
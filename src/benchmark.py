@@ -0,0 +1,301 @@
+# Python Standard Module Imprt
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+# External Module Import
+from loguru import logger
+
+# Repo-Defined Module Import
+from main import ALGORITHMS, mkdir_conditional
+from utils import data_reader, metrics, quest_generator
+
+# Synthetic datasets in IBM Quest notation, T: average transaction length, I: average pattern length, D: count of transactions
+# N: count of items, L: count of patterns
+QUEST_DATASETS = {
+    "Quest_T5I2D2K": dict(n_transactions=2000, avg_transaction_length=5, avg_pattern_length=2, n_patterns=50, n_items=100),
+    "Quest_T10I4D5K": dict(n_transactions=5000, avg_transaction_length=10, avg_pattern_length=4, n_patterns=100, n_items=200),
+}
+
+REAL_DATASETS = {
+    "Kaggle_GMB": data_reader.GMB_DATASET_PATH,
+    "IBM_QSDG": data_reader.QSDG_DATASET_PATH,
+}
+
+# Adjust this parameter in needed
+MINSUP_GRID = [0.02, 0.05, 0.1]
+REFERENCE_ALGORITHM = "aprori"
+TIMEOUT = 300               # Seconds for each run
+REGRESSION_TOLERANCE = 0.2  # Run is a regression if it is 20% slower than baseline
+REGRESSION_MIN_TIME = 0.05  # Ignore runs faster than this in regression check, their timing is noisy
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark frequent itemset miners")
+    parser.add_argument(
+        "-d", "--dataset", nargs="+", default=list(QUEST_DATASETS) + list(REAL_DATASETS),
+        help=f"dataset(s), preset names ({', '.join(list(QUEST_DATASETS) + list(REAL_DATASETS))}) or NAME=PATH",
+    )
+    parser.add_argument("-a", "--algorithm", nargs="+", choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument("-s", "--minsup", nargs="+", type=float, default=MINSUP_GRID)
+    parser.add_argument(
+        "-r", "--reference", choices=list(ALGORITHMS), default=REFERENCE_ALGORITHM,
+        help="algorithm whose result other algorithms are checked against",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed of synthetic datasets")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds for each run")
+    parser.add_argument("--trace-memory", action="store_true", help="record peak Python heap by tracemalloc")
+    parser.add_argument("--data-dir", default="./benchmark/data", help="directory of generated synthetic datasets")
+    parser.add_argument("-o", "--output", default=None, help="path of JSON report, defaults to ./benchmark/report_<time>.json")
+    parser.add_argument("--baseline", default=None, help="JSON report to be compared for regressions")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    return parser.parse_args()
+
+
+def prepare_datasets(dataset_args: List[str], data_dir: str, seed: int) -> Dict[str, str]:
+    """Resolve dataset arguments into paths, generate synthetic datasets if needed
+
+    Args:
+        dataset_args (List[str]): preset names or NAME=PATH
+        data_dir (str): directory of generated synthetic datasets
+        seed (int): random seed of synthetic datasets
+
+    Returns:
+        Dict[str, str]: dataset name -> dataset path
+    """
+    datasets: Dict[str, str] = {}
+    for dataset in dataset_args:
+        if dataset in QUEST_DATASETS:
+            dataset_path = os.path.join(data_dir, f"{dataset}_seed{seed}.csv")
+            if not os.path.isfile(dataset_path):
+                logger.info(f"Generate synthetic dataset {dataset}, seed: {seed}")
+                quest_generator.write_transactions(
+                    quest_generator.generate_quest_transactions(**QUEST_DATASETS[dataset], seed=seed),
+                    dataset_path,
+                )
+            datasets[dataset] = dataset_path
+        elif dataset in REAL_DATASETS:
+            if not os.path.isfile(REAL_DATASETS[dataset]):
+                logger.warning(f"Skip dataset {dataset}, {REAL_DATASETS[dataset]} is not found")
+                continue
+            datasets[dataset] = REAL_DATASETS[dataset]
+        else:
+            dataset_name, dataset_path = dataset.split("=", 1)
+            datasets[dataset_name] = dataset_path
+
+    return datasets
+
+
+def _run_miner(algorithm: str, dataset_path: str, minsup: float, trace_memory: bool) -> Dict[str, Any]:
+    find_frequent_itemset, _ = ALGORITHMS[algorithm]
+    transactions = data_reader.read_transactions(dataset_path)
+
+    metrics.enable(trace_memory)
+    start_time = time.perf_counter()
+    k_frequent_itemset = find_frequent_itemset(transactions, minsup)
+    wall_time = time.perf_counter() - start_time
+    metrics_record = metrics.snapshot()
+    metrics.disable()
+
+    return {
+        "wall_time": wall_time,
+        "metrics": metrics_record,
+        "k_frequent_itemset": k_frequent_itemset,
+    }
+
+
+def run_miner(algorithm: str, dataset_path: str, minsup: float, trace_memory: bool, timeout: float) -> Dict[str, Any]:
+    """Run a miner in a fresh process, so that peak RSS belongs to this run only
+
+    Args:
+        algorithm (str): key of ALGORITHMS
+        dataset_path (str): path of dataset
+        minsup (float): minimum support
+        trace_memory (bool): record peak Python heap by tracemalloc
+        timeout (float): seconds before the run is terminated
+
+    Returns:
+        Dict[str, Any]: wall time, metrics record and k-frequent itemset, or None on timeout
+    """
+    with multiprocessing.Pool(1) as pool:
+        async_result = pool.apply_async(_run_miner, (algorithm, dataset_path, minsup, trace_memory))
+        try:
+            return async_result.get(timeout)
+        except multiprocessing.TimeoutError:
+            return None
+
+
+def compare_frequent_itemset(
+    k_frequent_itemset: Dict[int, Dict[Tuple[Any], int]],
+    reference_k_frequent_itemset: Dict[int, Dict[Tuple[Any], int]],
+) -> Dict[str, int]:
+    """Compare k-frequent itemset with result of reference algorithm
+
+    Returns:
+        Dict[str, int]: count of missing itemsets, extra itemsets and itemsets with different support count
+    """
+    itemsets = {
+        itemset: support_count
+        for length in k_frequent_itemset
+        for itemset, support_count in k_frequent_itemset[length].items()
+    }
+    reference_itemsets = {
+        itemset: support_count
+        for length in reference_k_frequent_itemset
+        for itemset, support_count in reference_k_frequent_itemset[length].items()
+    }
+
+    return {
+        "missing": len(reference_itemsets.keys() - itemsets.keys()),
+        "extra": len(itemsets.keys() - reference_itemsets.keys()),
+        "support_mismatch": sum(
+            1
+            for itemset in itemsets.keys() & reference_itemsets.keys()
+            if itemsets[itemset] != reference_itemsets[itemset]
+        ),
+    }
+
+
+def find_regressions(
+    results: List[Dict[str, Any]],
+    baseline_results: List[Dict[str, Any]],
+    tolerance: float,
+) -> List[Dict[str, Any]]:
+    """Find runs slower than the same run in baseline report by more than tolerance
+
+    Returns:
+        List[Dict[str, Any]]: run key with current and baseline wall time
+    """
+    baseline_times = {
+        (result["dataset"], result["algorithm"], result["minsup"]): result["wall_time"]
+        for result in baseline_results
+        if result["wall_time"] is not None
+    }
+
+    regressions = []
+    for result in results:
+        key = (result["dataset"], result["algorithm"], result["minsup"])
+        if key not in baseline_times:
+            continue
+
+        baseline_time = baseline_times[key]
+        wall_time = result["wall_time"] if result["wall_time"] is not None else float("inf")
+        if wall_time > REGRESSION_MIN_TIME and wall_time > baseline_time * (1 + tolerance):
+            regressions.append(
+                {
+                    "dataset": key[0],
+                    "algorithm": key[1],
+                    "minsup": key[2],
+                    "wall_time": result["wall_time"],
+                    "baseline_wall_time": baseline_time,
+                }
+            )
+
+    return regressions
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    mkdir_conditional("./benchmark")
+    mkdir_conditional(args.data_dir)
+
+    datasets = prepare_datasets(args.dataset, args.data_dir, args.seed)
+
+    # Reference algorithm runs first, so that other algorithms can be checked right after their runs
+    algorithms = [args.reference] + [algorithm for algorithm in args.algorithm if algorithm != args.reference]
+
+    results: List[Dict[str, Any]] = []
+    for dataset_name, dataset_path in datasets.items():
+        for minsup in sorted(args.minsup, reverse=True):
+            reference_k_frequent_itemset = None
+
+            for algorithm in algorithms:
+                logger.info(f"{dataset_name} - Run {algorithm}, minsup: {minsup}")
+                run_result = run_miner(algorithm, dataset_path, minsup, args.trace_memory, args.timeout)
+
+                if run_result is None:
+                    logger.warning(f"{dataset_name} - {algorithm} does not finish in {args.timeout} seconds")
+                    results.append(
+                        {
+                            "dataset": dataset_name,
+                            "algorithm": algorithm,
+                            "minsup": minsup,
+                            "wall_time": None,
+                            "timeout": True,
+                        }
+                    )
+                    continue
+
+                k_frequent_itemset = run_result["k_frequent_itemset"]
+                result = {
+                    "dataset": dataset_name,
+                    "algorithm": algorithm,
+                    "minsup": minsup,
+                    "wall_time": run_result["wall_time"],
+                    "timeout": False,
+                    "itemset_count": {
+                        length: len(k_frequent_itemset[length])
+                        for length in k_frequent_itemset
+                        if len(k_frequent_itemset[length]) > 0
+                    },
+                    # Each run has its own worker process, so the process peak is the peak of this run
+                    "peak_rss_kb": run_result["metrics"].get("process_peak_rss_kb"),
+                    "tracemalloc_peak_bytes": run_result["metrics"].get("tracemalloc_peak_bytes"),
+                    "metrics": run_result["metrics"],
+                }
+
+                if algorithm == args.reference:
+                    reference_k_frequent_itemset = k_frequent_itemset
+                elif reference_k_frequent_itemset is not None:
+                    result["agreement"] = compare_frequent_itemset(k_frequent_itemset, reference_k_frequent_itemset)
+                    if any(result["agreement"].values()):
+                        logger.error(f"{dataset_name} - {algorithm} disagrees with {args.reference}: {result['agreement']}")
+
+                logger.info(
+                    f"{dataset_name} - {algorithm}, minsup: {minsup} -> "
+                    f"{sum(result['itemset_count'].values())} itemset(s) in {result['wall_time']:.3f} seconds"
+                )
+                results.append(result)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "datasets": datasets,
+            "quest_datasets": {name: QUEST_DATASETS[name] for name in datasets if name in QUEST_DATASETS},
+            "seed": args.seed,
+            "algorithms": algorithms,
+            "reference": args.reference,
+            "minsup": args.minsup,
+            "timeout": args.timeout,
+        },
+        "results": results,
+    }
+
+    if args.baseline is not None:
+        with open(args.baseline, 'r', encoding='utf-8') as reader:
+            report["regressions"] = find_regressions(results, json.load(reader)["results"], args.tolerance)
+        for regression in report["regressions"]:
+            logger.error(f"Regression: {regression}")
+
+    output_path = args.output or f"./benchmark/report_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_path, 'w', encoding='utf-8') as writer:
+        json.dump(report, writer, indent=2)
+    logger.info(f"Write benchmark report into {output_path}")
+
+    mismatch_count = sum(1 for result in results if any(result.get("agreement", {}).values()))
+    if mismatch_count > 0 or len(report.get("regressions", [])) > 0:
+        logger.error(f"{mismatch_count} mismatch(es), {len(report.get('regressions', []))} regression(s)")
+        sys.exit(1)
+
+    logger.success("End of the benchmark")
@@ -1,153 +1,309 @@
 # Python Standard Module Imprt
+import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Tuple
 
 # External Module Import
 from loguru import logger
 
 # Repo-Defined Module Import
-from utils import data_reader
-from algorithms import aprori, fp_growth
-
-PHASE_CNT = 10
+from utils import data_reader, metrics, output_writer, result_cache, threshold_sweep
+from utils.constraints import MiningConstraints
+from algorithms import aprori, declat, fp_growth, hybrid, vertical
 
 # Adjust this parameter in needed
 MINSUP = 0.02
 MINCONF = 0.05
 
-def mkdir_conditional(dir_path: str) -> None:
-    if not os.path.isdir(dir_path):
-        os.mkdir(dir_path)
-
+# Default datasets, in NAME=PATH format
+DATASETS = [
+    f"Kaggle_GMB={data_reader.GMB_DATASET_PATH}",
+    f"IBM_QSDG={data_reader.QSDG_DATASET_PATH}",
+]
 
-if __name__ == "__main__":
+# Algorithm name -> (frequent itemset miner, tag in output file name)
+ALGORITHMS = {
+    "aprori": (aprori.find_frequent_itemset, "APR"),
+    "fp_growth": (fp_growth.find_frequent_itemset, "FPG"),
+    "vertical": (vertical.find_frequent_itemset, "VRT"),
+    "declat": (declat.find_frequent_itemset, "DEC"),
+    "hybrid": (hybrid.find_frequent_itemset, "HYB"),
+}
 
-    mkdir_conditional("./output")
+# Algorithms run when --algorithm is not given
+# FP-Growth over-counts supports and generates extra itemsets, it runs only if given until it is fixed
+DEFAULT_ALGORITHMS = ["aprori", "declat"]
 
-    logger.info(f"[Phase 1/{PHASE_CNT}] Read Kaggle GMB (Groceries Marketing Basket) Dataset")
-    gmb_transactions = data_reader.read_gmb_data()
+STAGES = threshold_sweep.STAGES
 
-    logger.info(f"[Phase 2/{PHASE_CNT}] GMB - Obtain frequent itemset by Aprori algorithm,, minsup: {MINSUP}")
-    aprori_gmb_frequent_itemset = aprori.find_frequent_itemset(
-        gmb_transactions,
-        MINSUP,
-    )
 
-    logger.info(f"[Phase 3/{PHASE_CNT}] GMB - Obtain association rules by Aprori algorithm,, minconf: {MINCONF}")
-    aprori_gmb_association_rules = aprori.find_association_rule(
-        aprori_gmb_frequent_itemset,
-        MINCONF,
-    )
+def mkdir_conditional(dir_path: str) -> None:
+    if not os.path.isdir(dir_path):
+        os.mkdir(dir_path)
 
-    logger.info("GMB - End of finding association rules by Aprori algorithm")
 
-    logger.info("GMB - Aprori - Write into output files")
-    with open(f'./output/Kaggle_GMB_APR_APR_FI_Minsup_{MINSUP}.csv', 'w+') as writer:
-        writer.write(f"frequent itemset, support count\n")
-        for length in aprori_gmb_frequent_itemset:
-            for itemset in aprori_gmb_frequent_itemset[length]:
-                writer.write(f"{itemset}, {aprori_gmb_frequent_itemset[length][itemset]}\n")
+def parse_dataset(dataset: str) -> Tuple[str, str]:
+    """Parse dataset argument in NAME=PATH or PATH format
 
-    with open(f'./output/Kaggle_GMB_APR_APR_AR_Minsup_{MINSUP}_Minconf_{MINCONF}.csv', 'w+') as writer:
-        writer.write(f"association runle, confidence\n")
+    Args:
+        dataset (str): dataset argument
 
-        for itemset in aprori_gmb_association_rules:
-            for oplen in aprori_gmb_association_rules[itemset]:
-                for rule in aprori_gmb_association_rules[itemset][oplen]:
-                    writer.write(f"({rule[0]} -> {rule[1]}), {aprori_gmb_association_rules[itemset][oplen][rule]:.2f}\n")
+    Returns:
+        Tuple[str, str]: (dataset name, dataset path)
+    """
+    if "=" in dataset:
+        dataset_name, dataset_path = dataset.split("=", 1)
+    else:
+        dataset_path = dataset
+        dataset_name = os.path.splitext(os.path.basename(dataset_path))[0]
+    return dataset_name, dataset_path
 
 
-    logger.info(f"[Phase 4/{PHASE_CNT}] GMB - Obtain frequent itemset by FP-Growth algorithm,, minsup: {MINSUP}")
-    fpgrowth_gmb_frequent_itemset = fp_growth.find_frequent_itemset(
-        gmb_transactions,
-        MINSUP,
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Association analysis by Aprori, FP-Growth, vertical bitmaps, dEclat and hybrid algorithm")
+    parser.add_argument(
+        "-d", "--dataset", nargs="+", default=DATASETS,
+        help="dataset(s) in NAME=PATH or PATH format, one comma-separated transaction per line",
     )
-
-    # print(fpgrowth_frequent_itemset[2])
-
-    logger.info(f"[Phase 5/{PHASE_CNT}] GMB - Obtain association rules by FP-Growth algorithm,, minconf: {MINCONF}")
-    fpgrowth_association_rules = aprori.find_association_rule(
-        fpgrowth_gmb_frequent_itemset,
-        MINCONF,
+    parser.add_argument(
+        "-a", "--algorithm", nargs="+", choices=list(ALGORITHMS), default=DEFAULT_ALGORITHMS,
+        help="algorithm(s) for finding frequent itemset",
     )
-
-    logger.info("GMB - End of finding association rules by FP-Growth algorithm")
-
-    logger.info("GMB - FP-Growth Write into output files")
-    with open(f'./output/Kaggle_FPG_APR_APR_FI_Minsup_{MINSUP}.csv', 'w+') as writer:
-        writer.write(f"frequent itemset, support count\n")
-        for length in fpgrowth_gmb_frequent_itemset:
-            for itemset in fpgrowth_gmb_frequent_itemset[length]:
-                writer.write(f"{itemset}, {fpgrowth_gmb_frequent_itemset[length][itemset]}\n")
-
-    with open(f'./output/Kaggle_FPG_APR_APR_AR_Minsup_{MINSUP}_Minconf_{MINCONF}.csv', 'w+') as writer:
-        writer.write(f"association runle, confidence\n")
-
-        for itemset in aprori_gmb_association_rules:
-            for oplen in aprori_gmb_association_rules[itemset]:
-                for rule in aprori_gmb_association_rules[itemset][oplen]:
-                    writer.write(f"({rule[0]} -> {rule[1]}), {aprori_gmb_association_rules[itemset][oplen][rule]:.2f}\n")
-
-
-    logger.info(f"[Phase 6/{PHASE_CNT}] Read IBM QSDG Dataset")
-    qsdg_transactions = data_reader.read_qsdg_data()
-
-    logger.info(f"[Phase 7/{PHASE_CNT}] QSDG - Obtain frequent itemset by Aprori algorithm,, minsup: {MINSUP}")
-    aprori_qsdg_frequent_itemset = aprori.find_frequent_itemset(
-        qsdg_transactions,
-        MINSUP,
+    parser.add_argument(
+        "-s", "--minsup", nargs="+", type=float, default=[MINSUP],
+        help="minimum support(s), mined once at the lowest value",
     )
-
-    logger.info(f"[Phase 8/{PHASE_CNT}] QSDG - Obtain association rules by Aprori algorithm,, minconf: {MINCONF}")
-    aprori_qsdg_association_rules = aprori.find_association_rule(
-        aprori_qsdg_frequent_itemset,
-        MINCONF,
+    parser.add_argument(
+        "-c", "--minconf", nargs="+", type=float, default=[MINCONF],
+        help="minimum confidence(s)",
     )
-
-    logger.info("QSDG - Aprori - Write into output files")
-    with open(f'./output/IBM_QSDG_APR_APR_FI_Minsup_{MINSUP}.csv', 'w+') as writer:
-        writer.write(f"frequent itemset, support count\n")
-        for length in aprori_qsdg_frequent_itemset:
-            for itemset in aprori_qsdg_frequent_itemset[length]:
-                writer.write(f"{itemset}, {aprori_qsdg_frequent_itemset[length][itemset]}\n")
-
-    with open(f'./output/IBM_QSDG_APR_APR_AR_Minsup_{MINSUP}_Minconf_{MINCONF}.csv', 'w+') as writer:
-        writer.write(f"association runle, confidence\n")
-
-        for itemset in aprori_qsdg_association_rules:
-            for oplen in aprori_qsdg_association_rules[itemset]:
-                for rule in aprori_qsdg_association_rules[itemset][oplen]:
-                    writer.write(f"({rule[0]} -> {rule[1]}), {aprori_qsdg_association_rules[itemset][oplen][rule]:.2f}\n")
-
-    logger.info("QSDG - End of finding association rules by Aprori algorithm")
-
-    logger.info(f"[Phase 9/{PHASE_CNT}] QSDG - Obtain frequent itemset by FP-Growth algorithm,, minsup: {MINSUP}")
-    fpgrowth_qsdg_frequent_itemset = fp_growth.find_frequent_itemset(
-        qsdg_transactions,
-        MINSUP,
+    parser.add_argument(
+        "--stage", nargs="+", choices=STAGES, default=STAGES,
+        help="stage(s) whose result is written into output files",
     )
-
-    logger.info(f"[Phase 10/{PHASE_CNT}] QSDG - Obtain frequent itemset by FP-Growth algorithm,, minsup: {MINSUP}")
-    fpgrowth_qsdg_association_rules = aprori.find_association_rule(
-        aprori_qsdg_frequent_itemset,
-        MINCONF,
+    parser.add_argument(
+        "-j", "--workers", type=int, default=1,
+        help="count of worker processes for running dataset/algorithm jobs, or (minsup, minconf) pairs of a single job, concurrently",
+    )
+    parser.add_argument(
+        "-f", "--output-format", choices=output_writer.OUTPUT_FORMATS, default=output_writer.OUTPUT_FORMATS[0],
+        help="csv for streaming CSV, npz for compressed NumPy arrays with integer item IDs and vocabulary",
+    )
+    parser.add_argument("-o", "--output-dir", default="./output")
+    parser.add_argument("--cache-dir", default=result_cache.CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="always mine without the result cache")
+    parser.add_argument("--metrics-dir", default=None, help="write a JSON metrics record per job into this directory")
+    parser.add_argument("--profile-dir", default=None, help="write cProfile stats per job into this directory")
+    parser.add_argument(
+        "--trace-memory", action="store_true",
+        help="record peak Python heap by tracemalloc in metrics, slows down mining",
     )
 
-    logger.info("QSDG - End of finding association rules by FP-Growth algorithm")
-
-    logger.info("QSDG - FP-Growth - Write into output files")
-    with open(f'./output/IBM_QSDG_FPG_APR_FI_Minsup_{MINSUP}.csv', 'w+') as writer:
-        writer.write(f"frequent itemset, support count\n")
-        for length in fpgrowth_qsdg_frequent_itemset:
-            for itemset in fpgrowth_qsdg_frequent_itemset[length]:
-                writer.write(f"{itemset}, {fpgrowth_qsdg_frequent_itemset[length][itemset]}\n")
+    constraint_group = parser.add_argument_group("constraints", "pushed into mining and rule generation")
+    constraint_group.add_argument("--allow-items", nargs="+", default=None, help="itemsets only consist of these items")
+    constraint_group.add_argument("--exclude-items", nargs="+", default=[], help="itemsets never contain these items")
+    constraint_group.add_argument("--max-length", type=int, default=None, help="maximum length of itemsets")
+    constraint_group.add_argument("--antecedent-items", nargs="+", default=[], help="antecedent must contain these items")
+    constraint_group.add_argument("--consequent-items", nargs="+", default=[], help="consequent must contain these items")
+    constraint_group.add_argument("--max-antecedent-length", type=int, default=None)
+    constraint_group.add_argument("--max-consequent-length", type=int, default=None)
+
+    args = parser.parse_args()
+    args.constraints = build_constraints(parser, args)
+    return args
+
+
+def build_constraints(parser: argparse.ArgumentParser, args: argparse.Namespace) -> MiningConstraints:
+    """Build mining constraints from arguments, invalid constraints exit with a usage error
+
+    Args:
+        parser (argparse.ArgumentParser): parser of arguments
+        args (argparse.Namespace): parsed arguments
+
+    Returns:
+        MiningConstraints: constraints, None if no constraint is given
+    """
+    try:
+        constraints = MiningConstraints(
+            allowed_items=args.allow_items,
+            excluded_items=args.exclude_items,
+            max_length=args.max_length,
+            antecedent_items=args.antecedent_items,
+            consequent_items=args.consequent_items,
+            max_antecedent_length=args.max_antecedent_length,
+            max_consequent_length=args.max_consequent_length,
+        )
+    except ValueError as error:
+        parser.error(str(error))
+
+    if constraints.itemset_key() == "" and not constraints.has_rule_constraint():
+        return None
+    return constraints
+
+
+def run_job(
+    dataset_name: str,
+    dataset_path: str,
+    algorithm: str,
+    minsup_grid: List[float],
+    minconf_grid: List[float],
+    stages: List[str],
+    output_dir: str,
+    output_format: str,
+    cache_dir: str,
+    metrics_dir: str = None,
+    profile_dir: str = None,
+    trace_memory: bool = False,
+    constraints: MiningConstraints = None,
+    workers: int = 1,
+) -> List[Dict[str, Any]]:
+    """Run stages of a dataset/algorithm job for every (minsup, minconf) pair
+
+    Args:
+        dataset_name (str): dataset name, used as prefix of output files
+        dataset_path (str): path of dataset
+        algorithm (str): key of ALGORITHMS
+        minsup_grid (List[float]): minimum supports
+        minconf_grid (List[float]): minimum confidences
+        stages (List[str]): stages whose result is written into output files
+        output_dir (str): output directory
+        output_format (str): output format
+        cache_dir (str): cache directory, None for disabling the result cache
+        metrics_dir (str, optional): directory of JSON metrics record, None for disabling metrics. Defaults to None.
+        profile_dir (str, optional): directory of cProfile stats, None for disabling cProfile. Defaults to None.
+        trace_memory (bool, optional): record peak Python heap by tracemalloc. Defaults to False.
+        constraints (MiningConstraints, optional): itemset and rule constraints. Defaults to None.
+        workers (int, optional): count of worker processes for (minsup, minconf) pairs. Defaults to 1.
+
+    Returns:
+        List[Dict[str, Any]]: itemset count and rule count for each (minsup, minconf) pair
+    """
+    find_frequent_itemset, algorithm_tag = ALGORITHMS[algorithm]
+    output_prefix = os.path.join(output_dir, f"{dataset_name}_{algorithm_tag}_APR")
+
+    if metrics_dir is not None:
+        metrics.enable(
+            trace_memory,
+            dataset=dataset_name,
+            dataset_path=dataset_path,
+            algorithm=algorithm,
+            minsup=minsup_grid,
+            minconf=minconf_grid,
+        )
+
+    with metrics.profile(
+        os.path.join(profile_dir, f"{dataset_name}_{algorithm_tag}.prof") if profile_dir is not None else None
+    ):
+        job_result = _run_job_stages(
+            dataset_name,
+            dataset_path,
+            algorithm,
+            minsup_grid,
+            minconf_grid,
+            stages,
+            output_prefix,
+            output_format,
+            cache_dir,
+            constraints,
+            workers,
+        )
+
+    if metrics_dir is not None:
+        metrics.dump(os.path.join(metrics_dir, f"{dataset_name}_{algorithm_tag}_metrics.json"))
+        metrics.disable()
+
+    logger.info(f"{dataset_name} - End of association analysis by {algorithm}")
+    return job_result
+
+
+def _run_job_stages(
+    dataset_name: str,
+    dataset_path: str,
+    algorithm: str,
+    minsup_grid: List[float],
+    minconf_grid: List[float],
+    stages: List[str],
+    output_prefix: str,
+    output_format: str,
+    cache_dir: str,
+    constraints: MiningConstraints = None,
+    workers: int = 1,
+) -> List[Dict[str, Any]]:
+    find_frequent_itemset, _ = ALGORITHMS[algorithm]
+
+    logger.info(f"{dataset_name} - Read dataset {dataset_path}")
+    transactions = data_reader.read_transactions(dataset_path)
+
+    logger.info(f"{dataset_name} - Obtain frequent itemset and association rules by {algorithm}")
+    job_result = threshold_sweep.sweep_thresholds(
+        find_frequent_itemset,
+        transactions,
+        minsup_grid,
+        minconf_grid,
+        algorithm,
+        output_prefix,
+        workers,
+        cache_dir,
+        constraints,
+        output_format,
+        stages,
+    )
 
-    with open(f'./output/IBM_QSDG_FPG_APR_AR_Minsup_{MINSUP}_Minconf_{MINCONF}.csv', 'w+') as writer:
-        writer.write(f"association runle, confidence\n")
+    return [
+        {"dataset": dataset_name, "algorithm": algorithm, **point}
+        for point in job_result
+    ]
 
-        for itemset in aprori_qsdg_association_rules:
-            for oplen in aprori_qsdg_association_rules[itemset]:
-                for rule in aprori_qsdg_association_rules[itemset][oplen]:
-                    writer.write(f"({rule[0]} -> {rule[1]}), {aprori_qsdg_association_rules[itemset][oplen][rule]:.2f}\n")
 
+if __name__ == "__main__":
+    args = parse_args()
+
+    mkdir_conditional(args.output_dir)
+    for dir_path in (args.metrics_dir, args.profile_dir):
+        if dir_path is not None:
+            mkdir_conditional(dir_path)
+
+    # Workers run jobs in parallel if there are many, otherwise (minsup, minconf) pairs of the only job
+    datasets = [parse_dataset(dataset) for dataset in args.dataset]
+    parallel_jobs = args.workers > 1 and len(datasets) * len(args.algorithm) > 1
+    grid_workers = 1 if parallel_jobs else args.workers
+
+    jobs = [
+        (
+            dataset_name,
+            dataset_path,
+            algorithm,
+            args.minsup,
+            args.minconf,
+            args.stage,
+            args.output_dir,
+            args.output_format,
+            None if args.no_cache else args.cache_dir,
+            args.metrics_dir,
+            args.profile_dir,
+            args.trace_memory,
+            args.constraints,
+            grid_workers,
+        )
+        for dataset_name, dataset_path in datasets
+        for algorithm in args.algorithm
+    ]
+    logger.info(f"Run {len(jobs)} job(s) with {args.workers} worker(s)")
+
+    if parallel_jobs:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [executor.submit(run_job, *job) for job in jobs]
+            results = [future.result() for future in as_completed(futures)]
+    else:
+        results = [run_job(*job) for job in jobs]
+
+    for job_result in results:
+        for point in job_result:
+            logger.info(
+                f"{point['dataset']} - {point['algorithm']}, "
+                f"minsup: {point['minsup']}, minconf: {point['minconf']} -> "
+                f"{point['itemset_count']} frequent itemset(s), {point['rule_count']} association rule(s)"
+            )
 
     logger.success("End of the association rule analysis")
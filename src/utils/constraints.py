@@ -0,0 +1,144 @@
+import hashlib
+from typing import Any, Iterable, List, Tuple
+
+
+class MiningConstraints:
+    """Constraints pushed into frequent itemset mining and association rule generation
+
+    Itemset constraints are anti-monotone or succinct, so the constrained result is still closed
+    under subsets and find_association_rule() can look up support count of every antecedent.
+    - allowed_items: itemsets only consist of these items (None for all items)
+    - excluded_items: itemsets never contain these items
+    - max_length: maximum length of itemsets (None for unlimited)
+
+    Rule constraints
+    - antecedent_items: antecedent must contain all of these items
+    - consequent_items: consequent must contain all of these items
+    - max_antecedent_length / max_consequent_length: maximum length of antecedent / consequent (None for unlimited)
+    """
+    # Attribute of MiningConstraints
+    allowed_items: frozenset = None
+    excluded_items: frozenset = frozenset()
+    max_length: int = None
+    antecedent_items: frozenset = frozenset()
+    consequent_items: frozenset = frozenset()
+    max_antecedent_length: int = None
+    max_consequent_length: int = None
+
+    #------------------------------------------------------------------------------
+    # Initialization Function
+    def __init__(
+        self: 'MiningConstraints',
+        allowed_items: Iterable[Any] = None,
+        excluded_items: Iterable[Any] = (),
+        max_length: int = None,
+        antecedent_items: Iterable[Any] = (),
+        consequent_items: Iterable[Any] = (),
+        max_antecedent_length: int = None,
+        max_consequent_length: int = None,
+    ) -> 'MiningConstraints':
+        self.allowed_items = frozenset(allowed_items) if allowed_items is not None else None
+        self.excluded_items = frozenset(excluded_items)
+        self.max_length = max_length
+        self.antecedent_items = frozenset(antecedent_items)
+        self.consequent_items = frozenset(consequent_items)
+        self.max_antecedent_length = max_antecedent_length
+        self.max_consequent_length = max_consequent_length
+
+        for name, length in (
+            ("max_length", max_length),
+            ("max_antecedent_length", max_antecedent_length),
+            ("max_consequent_length", max_consequent_length),
+        ):
+            if length is not None and length < 1:
+                raise ValueError(f"{name} must be positive, got {length}")
+
+        required_items = self.antecedent_items | self.consequent_items
+        if self.allowed_items is not None and required_items - self.allowed_items:
+            raise ValueError(f"Items required by rule constraints are not allowed: {sorted(required_items - self.allowed_items, key=str)}")
+        if required_items & self.excluded_items:
+            raise ValueError(f"Items required by rule constraints are excluded: {sorted(required_items & self.excluded_items, key=str)}")
+
+    #------------------------------------------------------------------------------
+    # Itemset Constraints
+    def has_item_filter(self: 'MiningConstraints') -> bool:
+        return self.allowed_items is not None or len(self.excluded_items) > 0
+
+    def is_item_allowed(self: 'MiningConstraints', item: Any) -> bool:
+        return (
+            (self.allowed_items is None or item in self.allowed_items)
+            and item not in self.excluded_items
+        )
+
+    def allows_length(self: 'MiningConstraints', length: int) -> bool:
+        return self.max_length is None or length <= self.max_length
+
+    def is_itemset_allowed(self: 'MiningConstraints', itemset: Tuple[Any]) -> bool:
+        return self.allows_length(len(itemset)) and all(self.is_item_allowed(item) for item in itemset)
+
+    def itemset_key(self: 'MiningConstraints') -> str:
+        """Identify itemset constraints, e.g. as a part of cache key
+
+        Returns:
+            str: empty string if no itemset constraint is set, otherwise a short digest
+        """
+        if not self.has_item_filter() and self.max_length is None:
+            return ""
+
+        description = repr((
+            sorted(map(str, self.allowed_items)) if self.allowed_items is not None else None,
+            sorted(map(str, self.excluded_items)),
+            self.max_length,
+        ))
+        return hashlib.sha1(description.encode("utf-8")).hexdigest()[:12]
+
+    #------------------------------------------------------------------------------
+    # Rule Constraints
+    def has_rule_constraint(self: 'MiningConstraints') -> bool:
+        return (
+            len(self.antecedent_items) > 0
+            or len(self.consequent_items) > 0
+            or self.max_antecedent_length is not None
+            or self.max_consequent_length is not None
+        )
+
+    def may_contain_rule(self: 'MiningConstraints', itemset: Tuple[Any]) -> bool:
+        """Check if a frequent itemset contains items required by both sides of rules"""
+        return (self.antecedent_items | self.consequent_items).issubset(itemset)
+
+    def is_antecedent_viable(self: 'MiningConstraints', antecedent: Tuple[Any]) -> bool:
+        """Check required antecedent items, rule expansion only moves items out of antecedent so it is anti-monotone"""
+        return self.antecedent_items.issubset(antecedent)
+
+    def allows_consequent_length(self: 'MiningConstraints', length: int) -> bool:
+        return self.max_consequent_length is None or length <= self.max_consequent_length
+
+    def accepts_rule(self: 'MiningConstraints', antecedent: Tuple[Any], consequent: Tuple[Any]) -> bool:
+        return (
+            self.antecedent_items.issubset(antecedent)
+            and self.consequent_items.issubset(consequent)
+            and (self.max_antecedent_length is None or len(antecedent) <= self.max_antecedent_length)
+            and self.allows_consequent_length(len(consequent))
+        )
+
+
+def filter_transactions(
+    transactions: List[List[Any]],
+    constraints: MiningConstraints,
+) -> List[List[Any]]:
+    """Drop items which are not allowed by item filters, transactions are kept so that count of transactions holds
+
+    Args:
+        transactions (List[List[Any]]): List of Transactions.
+        constraints (MiningConstraints): constraints, None for no constraint
+
+    Returns:
+        List[List[Any]]: filtered transactions, or input transactions if there is no item filter
+    """
+    if constraints is None or not constraints.has_item_filter():
+        return transactions
+
+    return [
+        [item for item in transaction if constraints.is_item_allowed(item)]
+        for transaction in transactions
+    ]
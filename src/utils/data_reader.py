@@ -2,40 +2,54 @@ from typing import List
 
 from loguru import logger
 
-def read_gmb_data() -> List[List[str]]:
-    """Read Kaggle GMB Dataset
+from utils import metrics
+
+GMB_DATASET_PATH = './dataset/Kaggle_GMB/groceries.csv'
+# TODO: Replace Testing File Name for verification
+QSDG_DATASET_PATH = './dataset/IBM/ibm-2021_preprocessed.csv'
+
+
+def read_transactions(dataset_path: str) -> List[List[str]]:
+    """Read transactions from a basket file, one comma-separated transaction per line
+
+    Args:
+        dataset_path (str): path of basket file
 
     Returns:
         List[List[str]]: List of Transactions. For each transaction, it includes items inside.
     """
-    with open('./dataset/Kaggle_GMB/groceries.csv', 'r', encoding='utf-8') as gmb_list_fd:
-        gmb_list_data = [line[:-1].split(',') for line in gmb_list_fd.readlines()]
-    logger.debug(f"Read {len(gmb_list_data)} Transactions")
+    with metrics.phase("data_reader.read_transactions"):
+        with open(dataset_path, 'r', encoding='utf-8') as list_fd:
+            # Blank line is an empty transaction
+            list_data = [line.rstrip('\n').split(',') if line.strip('\n') else [] for line in list_fd.readlines()]
+    logger.debug(f"Read {len(list_data)} Transactions from {dataset_path}")
+
+    metrics.record("data_reader.transactions", len(list_data))
+    if metrics.is_enabled():
+        metrics.record("data_reader.items", sum(len(transaction) for transaction in list_data))
 
     # Verify Data Type
-    for transaction in gmb_list_data:
+    for transaction in list_data:
         assert isinstance(transaction, list)
         for item in transaction:
             assert isinstance(item, str)
 
-    return gmb_list_data
+    return list_data
 
 
-def read_qsdg_data() -> List[List[str]]:
-    """Read IBM QSDG Dataset
+def read_gmb_data() -> List[List[str]]:
+    """Read Kaggle GMB Dataset
 
     Returns:
         List[List[str]]: List of Transactions. For each transaction, it includes items inside.
     """
-    # TODO: Replace Testing File Name for verification
-    with open('./dataset/IBM/ibm-2021_preprocessed.csv', 'r', encoding='utf-8') as qsdg_list_fd:
-        qsdg_list_data = [line[:-1].split(',') for line in qsdg_list_fd.readlines()]
-    logger.debug(f"Read {len(qsdg_list_data)} Transactions")
+    return read_transactions(GMB_DATASET_PATH)
 
-    # Verify Data Type
-    for transaction in qsdg_list_data:
-        assert isinstance(transaction, list)
-        for item in transaction:
-            assert isinstance(item, str)
 
-    return qsdg_list_data
+def read_qsdg_data() -> List[List[str]]:
+    """Read IBM QSDG Dataset
+
+    Returns:
+        List[List[str]]: List of Transactions. For each transaction, it includes items inside.
+    """
+    return read_transactions(QSDG_DATASET_PATH)
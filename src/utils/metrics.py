@@ -0,0 +1,192 @@
+import cProfile
+import copy
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict
+
+from loguru import logger
+
+try:
+    import resource     # Not available on Windows
+except ImportError:
+    resource = None
+
+# Metrics record of current run, collected only while enabled
+# Call sites check is_enabled() or use phase(), which costs a flag test when disabled
+_enabled: bool = False
+_trace_memory: bool = False
+_record: Dict[str, Any] = {}
+
+
+class _Phase:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start_time = 0.0
+
+    def __enter__(self) -> '_Phase':
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, *_) -> None:
+        elapsed = time.perf_counter() - self.start_time
+        phase_record = _record["phases"].setdefault(self.name, {"wall_time": 0.0, "calls": 0})
+        phase_record["wall_time"] += elapsed
+        phase_record["calls"] += 1
+
+
+class _NullPhase:
+    def __enter__(self) -> '_NullPhase':
+        return self
+
+    def __exit__(self, *_) -> None:
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def enable(trace_memory: bool = False, **labels: Any) -> None:
+    """Enable metrics collection and start a new run record
+
+    Args:
+        trace_memory (bool, optional): trace peak Python heap by tracemalloc, which slows down mining. Defaults to False.
+        labels (Any): labels of run, e.g. dataset and algorithm
+    """
+    global _enabled, _trace_memory
+    _enabled = True
+    _trace_memory = trace_memory
+    reset(**labels)
+
+    if _trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable() -> None:
+    """Disable metrics collection"""
+    global _enabled
+    _enabled = False
+
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset(**labels: Any) -> None:
+    """Drop collected metrics and start a new run record
+
+    Args:
+        labels (Any): labels of run, e.g. dataset and algorithm
+    """
+    _record.clear()
+    _record["labels"] = dict(labels)
+    _record["phases"] = {}
+    _record["counters"] = {}
+
+    # ru_maxrss can not be reset, keep the peak so far to tell whether this run raised it
+    if resource is not None:
+        _record["process_peak_rss_kb_at_start"] = _process_peak_rss_kb()
+
+    # tracemalloc.reset_peak() is available since Python 3.9
+    if _trace_memory and tracemalloc.is_tracing() and hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+
+
+def phase(name: str):
+    """Measure wall time of a phase, use with 'with' statement
+
+    Args:
+        name (str): phase name, e.g. aprori.level_2
+
+    Returns:
+        context manager which adds elapsed time to the phase
+    """
+    return _Phase(name) if _enabled else _NULL_PHASE
+
+
+def record(name: str, value: Any) -> None:
+    """Set value of a counter
+
+    Args:
+        name (str): counter name, e.g. aprori.level_2.candidates
+        value (Any): JSON-serializable value
+    """
+    if _enabled:
+        _record["counters"][name] = value
+
+
+def increment(name: str, value: int = 1) -> None:
+    """Add value to a counter
+
+    Args:
+        name (str): counter name
+        value (int, optional): value to be added. Defaults to 1.
+    """
+    if _enabled:
+        _record["counters"][name] = _record["counters"].get(name, 0) + value
+
+
+def _process_peak_rss_kb() -> int:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def snapshot() -> Dict[str, Any]:
+    """Obtain metrics record of current run with memory usage
+
+    Peak RSS is the peak of the whole process, it covers earlier runs in the same process as well.
+    It is the peak of this run only if the run has its own process, as benchmark.run_miner() does.
+
+    Returns:
+        Dict[str, Any]: metrics record
+    """
+    metrics_record = copy.deepcopy(_record)
+
+    if resource is not None:
+        metrics_record["process_peak_rss_kb"] = _process_peak_rss_kb()
+    if _trace_memory and tracemalloc.is_tracing():
+        metrics_record["tracemalloc_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+
+    return metrics_record
+
+
+def dump(output_path: str) -> Dict[str, Any]:
+    """Write metrics record of current run into JSON file
+
+    Args:
+        output_path (str): path of JSON file
+
+    Returns:
+        Dict[str, Any]: written metrics record
+    """
+    metrics_record = snapshot()
+    with open(output_path, 'w', encoding='utf-8') as writer:
+        json.dump(metrics_record, writer, indent=2)
+
+    logger.debug(f"Write metrics into {output_path}")
+    return metrics_record
+
+
+@contextmanager
+def profile(output_path: str = None):
+    """Run cProfile while in 'with' statement and dump stats into file
+
+    Args:
+        output_path (str, optional): path of cProfile stats file, do nothing if None. Defaults to None.
+    """
+    if output_path is None:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(output_path)
+        logger.debug(f"Write cProfile stats into {output_path}")
@@ -0,0 +1,208 @@
+import csv
+import io
+import os
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+from loguru import logger
+
+# Output format is selected by extension of output file
+OUTPUT_FORMATS = ["csv", "npz"]
+
+# Separator of items inside an itemset column of CSV output
+# Itemsets whose items contain the separator or quote character are written as a nested CSV record
+ITEM_SEPARATOR = ";"
+ITEM_QUOTE = '"'
+
+# Count of rows passed to csv.writer.writerows() at once
+CSV_BATCH_SIZE = 8192
+CSV_BUFFER_SIZE = 1024 * 1024
+
+FREQUENT_ITEMSET_HEADER = ["itemset", "length", "support_count"]
+ASSOCIATION_RULE_HEADER = ["antecedent", "consequent", "confidence"]
+
+
+def _output_format(output_path: str) -> str:
+    output_format = os.path.splitext(output_path)[1][1:]
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_path}, expected one of {OUTPUT_FORMATS}")
+    return output_format
+
+
+def join_items(itemset: Tuple[Any]) -> str:
+    """Join items of an itemset into a CSV column, read back by result_reader.split_items()
+
+    Args:
+        itemset (Tuple[Any]): itemset
+
+    Returns:
+        str: items joined by ITEM_SEPARATOR, quoted as a nested CSV record if needed
+    """
+    items = [str(item) for item in itemset]
+    column = ITEM_SEPARATOR.join(items)
+    if ITEM_QUOTE not in column and column.count(ITEM_SEPARATOR) == len(items) - 1 and all(items):
+        return column
+
+    # Items contain separator, quote character or empty string, quote them so that splitting is unambiguous
+    buffer = io.StringIO()
+    csv.writer(buffer, delimiter=ITEM_SEPARATOR, quotechar=ITEM_QUOTE, lineterminator="").writerow(items)
+    return buffer.getvalue()
+
+
+def _write_csv_rows(output_path: str, header: List[str], rows: Iterable[List[Any]]) -> int:
+    row_count = 0
+    rows = iter(rows)
+    with open(output_path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as output_fd:
+        writer = csv.writer(output_fd)
+        writer.writerow(header)
+
+        # Write rows in batches to amortize per-call overhead of writer
+        batch = list(islice(rows, CSV_BATCH_SIZE))
+        while len(batch) > 0:
+            writer.writerows(batch)
+            row_count += len(batch)
+            batch = list(islice(rows, CSV_BATCH_SIZE))
+
+    return row_count
+
+
+def iterate_association_rule(
+    association_rules: Dict[Tuple[Any], Dict[int, Dict[Tuple[Tuple[Any], Tuple[Any]], float]]],
+) -> Iterator[Tuple[Tuple[Any], Tuple[Any], float]]:
+    """Flatten association rules into (antecedent, consequent, confidence)
+
+    Args:
+        association_rules (Dict[Tuple[Any], Dict[int, Dict[Tuple[Tuple[Any], Tuple[Any]], float]]]):
+            association rules from aprori.find_association_rule()
+
+    Yields:
+        Iterator[Tuple[Tuple[Any], Tuple[Any], float]]: (antecedent, consequent, confidence)
+    """
+    for itemset in association_rules:
+        for oplen in association_rules[itemset]:
+            for rule, confidence in association_rules[itemset][oplen].items():
+                yield rule[0], rule[1], confidence
+
+
+def encode_itemsets(
+    itemsets: List[Tuple[Any]],
+    item_ids: Dict[Any, int],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode itemsets into integer item IDs in CSR layout
+
+    Args:
+        itemsets (List[Tuple[Any]]): itemsets to be encoded
+        item_ids (Dict[Any, int]): item -> index in vocabulary
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (concatenated item IDs, offsets of each itemset with length len(itemsets) + 1)
+    """
+    offsets = np.zeros(len(itemsets) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(itemset) for itemset in itemsets])
+    items = np.fromiter(
+        (item_ids[item] for itemset in itemsets for item in itemset),
+        dtype=np.int32,
+        count=int(offsets[-1]),
+    )
+    return items, offsets
+
+
+def build_vocabulary(itemsets: Iterable[Tuple[Any]]) -> Tuple[np.ndarray, Dict[Any, int]]:
+    """Collect items of itemsets into vocabulary table
+
+    Args:
+        itemsets (Iterable[Tuple[Any]]): itemsets
+
+    Returns:
+        Tuple[np.ndarray, Dict[Any, int]]: (vocabulary table, item -> index in vocabulary)
+    """
+    vocabulary = sorted({item for itemset in itemsets for item in itemset}, key=str)
+    return np.array(vocabulary), {item: item_id for item_id, item in enumerate(vocabulary)}
+
+
+def write_frequent_itemset(
+    k_frequent_itemset: Dict[int, Dict[Tuple[Any], int]],
+    output_path: str,
+) -> int:
+    """Write k-frequent itemset into output file, format is selected by extension (.csv or .npz)
+
+    Args:
+        k_frequent_itemset (Dict[int, Dict[Tuple[Any], int]]): k-frequent itemset
+        output_path (str): path of output file
+
+    Returns:
+        int: count of written itemsets
+    """
+    if _output_format(output_path) == "csv":
+        itemset_count = _write_csv_rows(
+            output_path,
+            FREQUENT_ITEMSET_HEADER,
+            (
+                [join_items(itemset), length, support_count]
+                for length in k_frequent_itemset
+                for itemset, support_count in k_frequent_itemset[length].items()
+            ),
+        )
+    else:
+        itemsets = [itemset for length in k_frequent_itemset for itemset in k_frequent_itemset[length]]
+        vocabulary, item_ids = build_vocabulary(itemsets)
+        items, offsets = encode_itemsets(itemsets, item_ids)
+        np.savez_compressed(
+            output_path,
+            vocabulary=vocabulary,
+            itemset_items=items,
+            itemset_offsets=offsets,
+            support_count=np.fromiter(
+                (k_frequent_itemset[len(itemset)][itemset] for itemset in itemsets),
+                dtype=np.int64,
+                count=len(itemsets),
+            ),
+        )
+        itemset_count = len(itemsets)
+
+    logger.debug(f"Write {itemset_count} frequent itemset(s) into {output_path}")
+    return itemset_count
+
+
+def write_association_rule(
+    association_rules: Dict[Tuple[Any], Dict[int, Dict[Tuple[Tuple[Any], Tuple[Any]], float]]],
+    output_path: str,
+) -> int:
+    """Write association rules into output file, format is selected by extension (.csv or .npz)
+
+    Args:
+        association_rules (Dict[Tuple[Any], Dict[int, Dict[Tuple[Tuple[Any], Tuple[Any]], float]]]):
+            association rules from aprori.find_association_rule()
+        output_path (str): path of output file
+
+    Returns:
+        int: count of written rules
+    """
+    if _output_format(output_path) == "csv":
+        rule_count = _write_csv_rows(
+            output_path,
+            ASSOCIATION_RULE_HEADER,
+            (
+                [join_items(antecedent), join_items(consequent), confidence]
+                for antecedent, consequent, confidence in iterate_association_rule(association_rules)
+            ),
+        )
+    else:
+        rules = list(iterate_association_rule(association_rules))
+        vocabulary, item_ids = build_vocabulary(rule[0] + rule[1] for rule in rules)
+        antecedent_items, antecedent_offsets = encode_itemsets([rule[0] for rule in rules], item_ids)
+        consequent_items, consequent_offsets = encode_itemsets([rule[1] for rule in rules], item_ids)
+        np.savez_compressed(
+            output_path,
+            vocabulary=vocabulary,
+            antecedent_items=antecedent_items,
+            antecedent_offsets=antecedent_offsets,
+            consequent_items=consequent_items,
+            consequent_offsets=consequent_offsets,
+            confidence=np.fromiter((rule[2] for rule in rules), dtype=np.float64, count=len(rules)),
+        )
+        rule_count = len(rules)
+
+    logger.debug(f"Write {rule_count} association rule(s) into {output_path}")
+    return rule_count
@@ -0,0 +1,127 @@
+from typing import List
+
+import numpy as np
+from loguru import logger
+
+# Patterns picked in a row without adding any new item before a transaction is given up shorter than its length,
+# e.g. when all items of patterns are already in the transaction. Patterns are picked until a transaction is not empty
+# Adjust this parameter in needed
+MAX_STALLED_PATTERNS = 16
+
+
+def generate_quest_transactions(
+    n_transactions: int,
+    avg_transaction_length: float,
+    avg_pattern_length: float,
+    n_patterns: int,
+    n_items: int,
+    correlation: float = 0.5,
+    corruption_mean: float = 0.5,
+    seed: int = 0,
+) -> List[List[str]]:
+    """Generate synthetic basket data in IBM Quest style (Agrawal & Srikant, 1994)
+
+    Transactions are filled with potentially frequent patterns picked by weight. Consecutive patterns
+    share part of their items, and each pattern is corrupted by dropping items when it is used.
+
+    Args:
+        n_transactions (int): count of transactions, |D|
+        avg_transaction_length (float): average length of transactions, |T|
+        avg_pattern_length (float): average length of potentially frequent patterns, |I|
+        n_patterns (int): count of potentially frequent patterns, |L|
+        n_items (int): count of items in universe, N
+        correlation (float, optional): mean fraction of items shared with previous pattern. Defaults to 0.5.
+        corruption_mean (float, optional): mean corruption level of patterns. Defaults to 0.5.
+        seed (int, optional): random seed, same seed generates same transactions. Defaults to 0.
+
+    Returns:
+        List[List[str]]: List of Transactions. For each transaction, it includes items inside.
+
+    Raises:
+        ValueError: parameter is out of range
+    """
+    if n_transactions < 0:
+        raise ValueError(f"n_transactions must be non-negative, got {n_transactions}")
+    if avg_transaction_length <= 0 or avg_pattern_length <= 0:
+        raise ValueError(
+            f"Average lengths must be positive, got {avg_transaction_length} and {avg_pattern_length}"
+        )
+    if n_patterns < 1 or n_items < 1:
+        raise ValueError(f"n_patterns and n_items must be positive, got {n_patterns} and {n_items}")
+    if correlation < 0 or not 0 <= corruption_mean <= 1:
+        raise ValueError(
+            f"correlation must be non-negative and corruption_mean in [0, 1], got {correlation} and {corruption_mean}"
+        )
+
+    rng = np.random.default_rng(seed)
+
+    # Generate potentially frequent patterns
+    patterns: List[List[int]] = []
+    for _ in range(n_patterns):
+        pattern_length = min(max(1, rng.poisson(avg_pattern_length)), n_items)
+        pattern = set()
+
+        # Part of items are picked from previous pattern
+        if len(patterns) > 0:
+            shared_count = min(round(rng.exponential(correlation) * pattern_length), pattern_length, len(patterns[-1]))
+            pattern.update(rng.choice(patterns[-1], size=shared_count, replace=False).tolist())
+
+        while len(pattern) < pattern_length:
+            pattern.add(int(rng.integers(n_items)))
+
+        patterns.append(sorted(pattern))
+
+    pattern_weights = rng.exponential(1.0, size=n_patterns)
+    pattern_weights /= pattern_weights.sum()
+    # Corruption level is capped below 1.0, otherwise a pattern can never contribute any item
+    pattern_corruptions = np.clip(rng.normal(corruption_mean, 0.1, size=n_patterns), 0.0, 0.95)
+
+    # Fill transactions with patterns
+    transactions: List[List[str]] = []
+    deferred_pattern = None
+    for _ in range(n_transactions):
+        transaction_length = max(1, rng.poisson(avg_transaction_length))
+        transaction = set()
+        stalled_count = 0
+
+        while len(transaction) < transaction_length and (stalled_count < MAX_STALLED_PATTERNS or len(transaction) == 0):
+            if deferred_pattern is not None:
+                pattern_index, deferred_pattern = deferred_pattern, None
+            else:
+                pattern_index = int(rng.choice(n_patterns, p=pattern_weights))
+
+            # Corrupt pattern by dropping items while uniform random value is less than corruption level
+            pattern = list(patterns[pattern_index])
+            while len(pattern) > 0 and rng.random() < pattern_corruptions[pattern_index]:
+                pattern.pop(int(rng.integers(len(pattern))))
+
+            # Pattern which does not fit is added in half of cases, otherwise moved to next transaction
+            if len(transaction) + len(pattern) > transaction_length and len(transaction) > 0:
+                if rng.random() < 0.5:
+                    transaction.update(pattern)
+                else:
+                    deferred_pattern = pattern_index
+                break
+
+            previous_length = len(transaction)
+            transaction.update(pattern)
+            stalled_count = stalled_count + 1 if len(transaction) == previous_length else 0
+
+        transactions.append([str(item) for item in sorted(transaction)])
+
+    logger.debug(
+        f"Generate {len(transactions)} transactions, "
+        f"average length {sum(map(len, transactions)) / max(1, len(transactions)):.2f}"
+    )
+    return transactions
+
+
+def write_transactions(transactions: List[List[str]], output_path: str) -> None:
+    """Write transactions in the format of data_reader.read_transactions()
+
+    Args:
+        transactions (List[List[str]]): List of Transactions.
+        output_path (str): path of output file
+    """
+    with open(output_path, 'w', encoding='utf-8') as writer:
+        writer.writelines(",".join(transaction) + "\n" for transaction in transactions)
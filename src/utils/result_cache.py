@@ -0,0 +1,316 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from utils import transaction_encoder
+from utils.constraints import MiningConstraints
+
+try:
+    import fcntl        # Not available on Windows
+except ImportError:
+    fcntl = None
+
+# Default cache location and eviction limits, adjust this parameter in needed
+CACHE_DIR = "./cache"
+CACHE_INDEX_FILE = "index.json"
+CACHE_LOCK_FILE = "index.lock"
+CACHE_MAX_ENTRIES = 32
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Version of cached results, part of cache key. Bump it whenever output of any miner changes,
+# e.g. a fix of FP-Growth, so that results of the old miner are never served again
+CACHE_VERSION = 1
+
+
+def minsup_to_count(transactions: List[List[Any]], minsup: float) -> int:
+    """Evaluate minimum support count in the same way as the mining algorithms
+
+    Args:
+        transactions (List[List[Any]]): List of Transactions.
+        minsup (float): minimum support for finding frequent itemset
+
+    Returns:
+        int: minimum support count
+    """
+    return round(minsup * len(transactions))
+
+
+def dataset_fingerprint(transactions: List[List[Any]]) -> str:
+    """Evaluate fingerprint of dataset by hashing all items of transactions in order
+
+    Args:
+        transactions (List[List[Any]]): List of Transactions. For each transaction, it stores items in List format.
+
+    Returns:
+        str: hex digest which identifies the dataset
+    """
+    hasher = hashlib.sha1()
+    for transaction in transactions:
+        hasher.update("\x1f".join(str(item) for item in transaction).encode("utf-8"))
+        hasher.update(b"\x1e")
+    return hasher.hexdigest()
+
+
+def filter_frequent_itemset(
+    k_frequent_itemset: Dict[int, Dict[Tuple[Any], int]],
+    minsup_count: int,
+) -> Dict[int, Dict[Tuple[Any], int]]:
+    """Filter k-frequent itemset mined with a lower minimum support count
+
+    Frequent itemsets are monotone in minimum support, so the result of a higher threshold
+    is exactly the subset of a lower-threshold result whose support count passes the new threshold.
+
+    Args:
+        k_frequent_itemset (Dict[int, Dict[Tuple[Any], int]]): k-frequent itemset mined with lower minsup
+        minsup_count (int): minimum support count to be applied
+
+    Returns:
+        Dict[int, Dict[Tuple[Any], int]]: k-frequent itemset, terminated with an empty level as the miners do
+    """
+    return transaction_encoder.build_k_frequent_itemset(
+        (itemset, support_count)
+        for length in k_frequent_itemset
+        for itemset, support_count in k_frequent_itemset[length].items()
+        if support_count >= minsup_count
+    )
+
+
+@contextmanager
+def _index_lock(cache_dir: str) -> Iterator[None]:
+    """Hold an exclusive lock on cache index, so that concurrent jobs do not lose each other's updates
+
+    Without fcntl the lock is skipped, a lost update only makes a later run mine again.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, CACHE_LOCK_FILE), 'a') as lock_fd:
+        if fcntl is not None:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_fd, fcntl.LOCK_UN)
+
+
+def _replace_atomically(target_path: str, mode: str, write: Callable[[Any], None]) -> None:
+    # Temporary file is unique per writer, then renamed over the target in one step
+    temp_fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target_path), suffix=".tmp")
+    try:
+        with os.fdopen(temp_fd, mode) as writer:
+            write(writer)
+        os.replace(temp_path, target_path)
+    except BaseException:
+        if os.path.isfile(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _read_index(cache_dir: str) -> Dict[str, Dict[str, Any]]:
+    index_path = os.path.join(cache_dir, CACHE_INDEX_FILE)
+    if not os.path.isfile(index_path):
+        return {}
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as reader:
+            return json.load(reader)
+    except (OSError, ValueError):
+        logger.warning(f"Broken cache index {index_path}, start with an empty cache")
+        return {}
+
+
+def _write_index(cache_dir: str, index: Dict[str, Dict[str, Any]]) -> None:
+    _replace_atomically(
+        os.path.join(cache_dir, CACHE_INDEX_FILE),
+        'w',
+        lambda writer: json.dump(index, writer, indent=2),
+    )
+
+
+def _evict(
+    cache_dir: str,
+    index: Dict[str, Dict[str, Any]],
+    max_entries: int,
+    max_bytes: int,
+) -> None:
+    # Remove least recently used entries until both entry count and total size are within limits
+    lru_keys = sorted(index, key=lambda key: index[key]["last_access"])
+    total_bytes = sum(entry["size"] for entry in index.values())
+
+    while lru_keys and (len(index) > max_entries or total_bytes > max_bytes):
+        key = lru_keys.pop(0)
+        entry = index.pop(key)
+        total_bytes -= entry["size"]
+
+        entry_path = os.path.join(cache_dir, entry["file"])
+        if os.path.isfile(entry_path):
+            os.remove(entry_path)
+        logger.debug(f"Evict cache entry {key}")
+
+
+def _load_entry(
+    fingerprint: str,
+    algorithm: str,
+    minsup_count: int,
+    cache_dir: str,
+    index: Dict[str, Dict[str, Any]],
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[int, Dict[Tuple[Any], int]]]]:
+    # Select entry with the highest minimum support count not above the requested one
+    reusable_keys = [
+        key
+        for key, entry in index.items()
+        if entry["fingerprint"] == fingerprint
+        and entry.get("version") == CACHE_VERSION
+        and entry["algorithm"] == algorithm
+        and entry["minsup_count"] <= minsup_count
+    ]
+    if len(reusable_keys) == 0:
+        return None, None
+
+    key = max(reusable_keys, key=lambda key: index[key]["minsup_count"])
+    entry = index[key]
+
+    try:
+        with open(os.path.join(cache_dir, entry["file"]), 'rb') as reader:
+            k_frequent_itemset = pickle.load(reader)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        logger.warning(f"Broken cache entry {key}, drop it")
+        index.pop(key)
+        _write_index(cache_dir, index)
+        return None, None
+
+    entry["last_access"] = time.time()
+    _write_index(cache_dir, index)
+
+    logger.debug(f"Cache hit {key}")
+    return entry, k_frequent_itemset
+
+
+def load_frequent_itemset(
+    fingerprint: str,
+    algorithm: str,
+    minsup_count: int,
+    cache_dir: str = CACHE_DIR,
+) -> Optional[Dict[int, Dict[Tuple[Any], int]]]:
+    """Load k-frequent itemset from cache, reuse the closest lower-minsup result if needed
+
+    Args:
+        fingerprint (str): dataset fingerprint from dataset_fingerprint()
+        algorithm (str): name of algorithm which mined the result
+        minsup_count (int): minimum support count
+        cache_dir (str, optional): cache directory. Defaults to CACHE_DIR.
+
+    Returns:
+        Optional[Dict[int, Dict[Tuple[Any], int]]]: k-frequent itemset, or None on cache miss
+    """
+    if not os.path.isdir(cache_dir):
+        return None
+
+    # Entry must not be evicted by another job between lookup and loading
+    with _index_lock(cache_dir):
+        index = _read_index(cache_dir)
+        entry, k_frequent_itemset = _load_entry(fingerprint, algorithm, minsup_count, cache_dir, index)
+
+    if k_frequent_itemset is None:
+        return None
+
+    if entry["minsup_count"] == minsup_count:
+        return k_frequent_itemset
+
+    logger.debug(f"Filter cache entry by minimum support count {minsup_count}")
+    return filter_frequent_itemset(k_frequent_itemset, minsup_count)
+
+
+def store_frequent_itemset(
+    fingerprint: str,
+    algorithm: str,
+    minsup_count: int,
+    k_frequent_itemset: Dict[int, Dict[Tuple[Any], int]],
+    cache_dir: str = CACHE_DIR,
+    max_entries: int = CACHE_MAX_ENTRIES,
+    max_bytes: int = CACHE_MAX_BYTES,
+) -> None:
+    """Store k-frequent itemset into cache and evict least recently used entries
+
+    Args:
+        fingerprint (str): dataset fingerprint from dataset_fingerprint()
+        algorithm (str): name of algorithm which mined the result
+        minsup_count (int): minimum support count
+        k_frequent_itemset (Dict[int, Dict[Tuple[Any], int]]): k-frequent itemset to be stored
+        cache_dir (str, optional): cache directory. Defaults to CACHE_DIR.
+        max_entries (int, optional): maximum count of entries. Defaults to CACHE_MAX_ENTRIES.
+        max_bytes (int, optional): maximum total size of entries. Defaults to CACHE_MAX_BYTES.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+
+    key = f"v{CACHE_VERSION}_{fingerprint}_{algorithm}_{minsup_count}"
+    entry_file = f"{key}.pkl"
+    entry_path = os.path.join(cache_dir, entry_file)
+
+    _replace_atomically(
+        entry_path,
+        'wb',
+        lambda writer: pickle.dump(k_frequent_itemset, writer, protocol=pickle.HIGHEST_PROTOCOL),
+    )
+
+    # Read, modify and write index under the lock, otherwise entries stored by concurrent jobs are lost
+    with _index_lock(cache_dir):
+        index = _read_index(cache_dir)
+        index[key] = {
+            "fingerprint": fingerprint,
+            "version": CACHE_VERSION,
+            "algorithm": algorithm,
+            "minsup_count": minsup_count,
+            "file": entry_file,
+            "size": os.path.getsize(entry_path),
+            "last_access": time.time(),
+        }
+
+        _evict(cache_dir, index, max_entries, max_bytes)
+        _write_index(cache_dir, index)
+    logger.debug(f"Store cache entry {key}")
+
+
+def cached_find_frequent_itemset(
+    find_frequent_itemset: Callable[..., Dict[int, Dict[Tuple[Any], int]]],
+    transactions: List[List[Any]],
+    minsup: float,
+    algorithm: str,
+    cache_dir: str = CACHE_DIR,
+    constraints: MiningConstraints = None,
+) -> Dict[int, Dict[Tuple[Any], int]]:
+    """Find frequent itemset through the result cache, run the miner only on cache miss
+
+    Args:
+        find_frequent_itemset (Callable): miner, e.g. aprori.find_frequent_itemset
+        transactions (List[List[Any]]): List of Transactions. For each transaction, it stores items in List format.
+        minsup (float): minimum support for finding frequent itemset
+        algorithm (str): name of algorithm, part of cache key
+        cache_dir (str, optional): cache directory. Defaults to CACHE_DIR.
+        constraints (MiningConstraints, optional): constraints pushed into the miner. Defaults to None.
+
+    Returns:
+        Dict[int, Dict[Tuple[Any], int]]: k-frequent itemset
+    """
+    fingerprint = dataset_fingerprint(transactions)
+    minsup_count = minsup_to_count(transactions, minsup)
+
+    # Results under different itemset constraints are cached separately, rule constraints do not matter here
+    if constraints is not None and constraints.itemset_key() != "":
+        algorithm = f"{algorithm}_{constraints.itemset_key()}"
+
+    k_frequent_itemset = load_frequent_itemset(fingerprint, algorithm, minsup_count, cache_dir)
+    if k_frequent_itemset is not None:
+        return k_frequent_itemset
+
+    logger.debug(f"Cache miss, run {algorithm} with minimum support count {minsup_count}")
+    k_frequent_itemset = find_frequent_itemset(transactions, minsup, constraints)
+    store_frequent_itemset(fingerprint, algorithm, minsup_count, k_frequent_itemset, cache_dir)
+
+    return k_frequent_itemset
@@ -0,0 +1,101 @@
+import csv
+import os
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from loguru import logger
+
+from utils import transaction_encoder
+from utils.output_writer import ITEM_QUOTE, ITEM_SEPARATOR
+
+
+def _decode_itemsets(vocabulary: np.ndarray, items: np.ndarray, offsets: np.ndarray) -> List[Tuple[Any]]:
+    decoded_items = vocabulary[items].tolist()
+    offsets = offsets.tolist()
+    return [
+        tuple(decoded_items[offsets[i]:offsets[i + 1]])
+        for i in range(len(offsets) - 1)
+    ]
+
+
+def split_items(column: str) -> Tuple[str]:
+    """Split a CSV column written by output_writer.join_items() into items
+
+    Args:
+        column (str): CSV column of an itemset
+
+    Returns:
+        Tuple[str]: items
+    """
+    if len(column) == 0:
+        return tuple()
+    if ITEM_QUOTE in column:
+        return tuple(next(csv.reader([column], delimiter=ITEM_SEPARATOR, quotechar=ITEM_QUOTE)))
+    return tuple(column.split(ITEM_SEPARATOR))
+
+
+def read_frequent_itemset(input_path: str) -> Dict[int, Dict[Tuple[Any], int]]:
+    """Read k-frequent itemset written by output_writer.write_frequent_itemset()
+
+    Args:
+        input_path (str): path of .csv or .npz file
+
+    Returns:
+        Dict[int, Dict[Tuple[Any], int]]: k-frequent itemset, terminated with an empty level as the miners do
+    """
+    if os.path.splitext(input_path)[1] == ".npz":
+        with np.load(input_path, allow_pickle=False) as npz_data:
+            itemsets = _decode_itemsets(npz_data["vocabulary"], npz_data["itemset_items"], npz_data["itemset_offsets"])
+            support_counts = npz_data["support_count"].tolist()
+    else:
+        with open(input_path, 'r', newline='', encoding='utf-8') as input_fd:
+            reader = csv.reader(input_fd)
+            next(reader)    # Skip header
+            itemsets, support_counts = [], []
+            for itemset, _, support_count in reader:
+                itemsets.append(split_items(itemset))
+                support_counts.append(int(support_count))
+
+    k_frequent_itemset = transaction_encoder.build_k_frequent_itemset(zip(itemsets, support_counts))
+
+    logger.debug(f"Read {len(itemsets)} frequent itemset(s) from {input_path}")
+    return k_frequent_itemset
+
+
+def read_association_rule(
+    input_path: str,
+) -> Dict[Tuple[Any], Dict[int, Dict[Tuple[Tuple[Any], Tuple[Any]], float]]]:
+    """Read association rules written by output_writer.write_association_rule()
+
+    Args:
+        input_path (str): path of .csv or .npz file
+
+    Returns:
+        Dict[Tuple[Any], Dict[int, Dict[Tuple[Tuple[Any], Tuple[Any]], float]]]:
+            association rules in the format of aprori.find_association_rule()
+    """
+    if os.path.splitext(input_path)[1] == ".npz":
+        with np.load(input_path, allow_pickle=False) as npz_data:
+            vocabulary = npz_data["vocabulary"]
+            antecedents = _decode_itemsets(vocabulary, npz_data["antecedent_items"], npz_data["antecedent_offsets"])
+            consequents = _decode_itemsets(vocabulary, npz_data["consequent_items"], npz_data["consequent_offsets"])
+            confidences = npz_data["confidence"].tolist()
+    else:
+        with open(input_path, 'r', newline='', encoding='utf-8') as input_fd:
+            reader = csv.reader(input_fd)
+            next(reader)    # Skip header
+            antecedents, consequents, confidences = [], [], []
+            for antecedent, consequent, confidence in reader:
+                antecedents.append(split_items(antecedent))
+                consequents.append(split_items(consequent))
+                confidences.append(float(confidence))
+
+    association_rules: Dict[Tuple[Any], Dict[int, Dict[Tuple[Tuple[Any], Tuple[Any]], float]]] = dict()
+    for antecedent, consequent, confidence in zip(antecedents, consequents, confidences):
+        itemset = tuple(sorted(antecedent + consequent))
+        association_rules.setdefault(itemset, dict()).setdefault(len(consequent), dict())[
+            (antecedent, consequent)
+        ] = confidence
+
+    logger.debug(f"Read {len(confidences)} association rule(s) from {input_path}")
+    return association_rules
@@ -0,0 +1,71 @@
+from multiprocessing import shared_memory
+from typing import Any, List
+
+import numpy as np
+from loguru import logger
+
+from utils import output_writer
+
+
+class SharedTransactions:
+    """Transactions encoded into integer item IDs in CSR layout and placed in shared memory
+
+    The creating process owns the shared memory blocks and unlinks them after use. Pickled instances,
+    e.g. initializer arguments of worker processes, attach to the same blocks by name without copying.
+    The small vocabulary table is pickled along with the instance.
+    """
+    # Attribute of SharedTransactions
+    vocabulary: List[Any] = None
+    transaction_count: int = 0
+    item_count: int = 0
+    items_memory: shared_memory.SharedMemory = None
+    offsets_memory: shared_memory.SharedMemory = None
+
+    #------------------------------------------------------------------------------
+    # Initialization Function
+    def __init__(self: 'SharedTransactions', transactions: List[List[Any]]) -> 'SharedTransactions':
+        vocabulary, item_ids = output_writer.build_vocabulary(transactions)
+        items, offsets = output_writer.encode_itemsets(transactions, item_ids)
+
+        self.vocabulary = vocabulary.tolist()
+        self.transaction_count = len(transactions)
+        self.item_count = len(items)
+
+        # Shared memory block can not be empty
+        self.items_memory = shared_memory.SharedMemory(create=True, size=max(1, items.nbytes))
+        self.offsets_memory = shared_memory.SharedMemory(create=True, size=offsets.nbytes)
+        np.ndarray(items.shape, dtype=items.dtype, buffer=self.items_memory.buf)[:] = items
+        np.ndarray(offsets.shape, dtype=offsets.dtype, buffer=self.offsets_memory.buf)[:] = offsets
+
+        logger.debug(
+            f"Share {self.transaction_count} transactions, {self.item_count} items, "
+            f"vocabulary size {len(self.vocabulary)} in {self.items_memory.name}, {self.offsets_memory.name}"
+        )
+
+    #------------------------------------------------------------------------------
+    # Member Function
+    def transactions(self: 'SharedTransactions') -> List[List[Any]]:
+        """Decode shared arrays into transactions in the format of data_reader.read_transactions()
+
+        Returns:
+            List[List[Any]]: List of Transactions. For each transaction, it stores items in List format.
+        """
+        items = np.ndarray((self.item_count,), dtype=np.int32, buffer=self.items_memory.buf)
+        offsets = np.ndarray((self.transaction_count + 1,), dtype=np.int64, buffer=self.offsets_memory.buf)
+
+        decoded_items = np.array(self.vocabulary, dtype=object)[items].tolist()
+        bounds = offsets.tolist()
+
+        # Release views before the blocks may be closed
+        del items, offsets
+
+        return [decoded_items[bounds[i]:bounds[i + 1]] for i in range(self.transaction_count)]
+
+    def close(self: 'SharedTransactions') -> None:
+        self.items_memory.close()
+        self.offsets_memory.close()
+
+    def unlink(self: 'SharedTransactions') -> None:
+        """Free shared memory blocks, called once by the creating process"""
+        self.items_memory.unlink()
+        self.offsets_memory.unlink()
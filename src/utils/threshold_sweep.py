@@ -0,0 +1,190 @@
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from loguru import logger
+
+from algorithms import aprori
+from utils import metrics, output_writer, result_cache, transaction_encoder
+from utils.constraints import MiningConstraints
+
+# Stages of a sweep, frequent itemset and association rule output files
+STAGES = ["itemset", "rule"]
+
+# Frequent itemsets of the lowest minsup in grid, sorted by support count in descending order
+# Assigned once per worker process by _init_worker()
+_sorted_itemsets: List[Tuple[int, Tuple[Any]]] = []
+_sorted_supports: List[int] = []
+_constraints: MiningConstraints = None
+
+
+def sort_frequent_itemset(
+    k_frequent_itemset: Dict[int, Dict[Tuple[Any], int]],
+) -> List[Tuple[int, Tuple[Any]]]:
+    """Flatten k-frequent itemset into list sorted by support count in descending order
+
+    Args:
+        k_frequent_itemset (Dict[int, Dict[Tuple[Any], int]]): k-frequent itemset
+
+    Returns:
+        List[Tuple[int, Tuple[Any]]]: list of (support count, itemset)
+    """
+    return sorted(
+        (
+            (support_count, itemset)
+            for length in k_frequent_itemset
+            for itemset, support_count in k_frequent_itemset[length].items()
+        ),
+        key=lambda pair: pair[0],
+        reverse=True,
+    )
+
+
+def slice_frequent_itemset(
+    sorted_itemsets: List[Tuple[int, Tuple[Any]]],
+    sorted_supports: List[int],
+    minsup_count: int,
+) -> Dict[int, Dict[Tuple[Any], int]]:
+    """Rebuild k-frequent itemset of a higher minimum support count from sorted itemsets
+
+    Args:
+        sorted_itemsets (List[Tuple[int, Tuple[Any]]]): output of sort_frequent_itemset()
+        sorted_supports (List[int]): negated support counts of sorted_itemsets, for bisection
+        minsup_count (int): minimum support count
+
+    Returns:
+        Dict[int, Dict[Tuple[Any], int]]: k-frequent itemset, terminated with an empty level as the miners do
+    """
+    # Itemsets with support count >= minsup_count form a prefix of sorted_itemsets
+    return transaction_encoder.build_k_frequent_itemset(
+        (itemset, support_count)
+        for support_count, itemset in sorted_itemsets[:bisect_right(sorted_supports, -minsup_count)]
+    )
+
+
+def _init_worker(sorted_itemsets: List[Tuple[int, Tuple[Any]]], constraints: MiningConstraints = None) -> None:
+    global _sorted_itemsets, _sorted_supports, _constraints
+    _sorted_itemsets = sorted_itemsets
+    _sorted_supports = [-support_count for support_count, _ in sorted_itemsets]
+    _constraints = constraints
+
+
+def _write_frequent_itemset(minsup_count: int, output_path: str) -> int:
+    k_frequent_itemset = slice_frequent_itemset(_sorted_itemsets, _sorted_supports, minsup_count)
+    with metrics.phase("output"):
+        return output_writer.write_frequent_itemset(k_frequent_itemset, output_path)
+
+
+def _write_association_rule(minsup_count: int, minconf: float, output_path: str) -> int:
+    k_frequent_itemset = slice_frequent_itemset(_sorted_itemsets, _sorted_supports, minsup_count)
+    with metrics.phase("rule"):
+        association_rules = aprori.find_association_rule(k_frequent_itemset, minconf, _constraints)
+    with metrics.phase("output"):
+        return output_writer.write_association_rule(association_rules, output_path)
+
+
+def sweep_thresholds(
+    find_frequent_itemset: Callable[..., Dict[int, Dict[Tuple[Any], int]]],
+    transactions: List[List[Any]],
+    minsup_grid: List[float],
+    minconf_grid: List[float],
+    algorithm: str,
+    output_prefix: str,
+    workers: int = None,
+    cache_dir: str = result_cache.CACHE_DIR,
+    constraints: MiningConstraints = None,
+    output_format: str = output_writer.OUTPUT_FORMATS[0],
+    stages: List[str] = STAGES,
+) -> List[Dict[str, Any]]:
+    """Mine once at the lowest minsup in grid and answer every (minsup, minconf) pair by slicing
+
+    Args:
+        find_frequent_itemset (Callable): miner, e.g. aprori.find_frequent_itemset
+        transactions (List[List[Any]]): List of Transactions. For each transaction, it stores items in List format.
+        minsup_grid (List[float]): minimum supports to be swept
+        minconf_grid (List[float]): minimum confidences to be swept
+        algorithm (str): name of algorithm, part of cache key
+        output_prefix (str): path prefix of output files, e.g. ./output/Kaggle_GMB_APR_APR
+        workers (int, optional): count of worker processes for grid points, 1 for running in the calling process.
+            Defaults to os.cpu_count().
+        cache_dir (str, optional): cache directory, None for disabling the result cache.
+            Defaults to result_cache.CACHE_DIR.
+        constraints (MiningConstraints, optional): itemset and rule constraints. Defaults to None.
+        output_format (str, optional): extension of output files. Defaults to output_writer.OUTPUT_FORMATS[0].
+        stages (List[str], optional): stages whose result is written into output files. Defaults to STAGES.
+
+    Returns:
+        List[Dict[str, Any]]: itemset count, rule count and output files for each grid point,
+            ordered by minsup and minconf. Counts and files of stages not run are None.
+    """
+    lowest_minsup = min(minsup_grid)
+    logger.debug(f"Sweep {len(minsup_grid)} x {len(minconf_grid)} grid, mine once with minsup: {lowest_minsup}")
+    with metrics.phase("mine"):
+        if cache_dir is None:
+            k_frequent_itemset = find_frequent_itemset(transactions, lowest_minsup, constraints)
+        else:
+            k_frequent_itemset = result_cache.cached_find_frequent_itemset(
+                find_frequent_itemset,
+                transactions,
+                lowest_minsup,
+                algorithm,
+                cache_dir,
+                constraints,
+            )
+    sorted_itemsets = sort_frequent_itemset(k_frequent_itemset)
+    sorted_supports = [-support_count for support_count, _ in sorted_itemsets]
+
+    # (output path, function, arguments) of output files to be written
+    tasks: List[Tuple[str, Callable[..., int], Tuple]] = []
+    sweep_result: List[Dict[str, Any]] = []
+    for minsup in sorted(minsup_grid):
+        minsup_count = result_cache.minsup_to_count(transactions, minsup)
+
+        itemset_output_path = None
+        if "itemset" in stages:
+            itemset_output_path = f"{output_prefix}_FI_Minsup_{minsup}.{output_format}"
+            tasks.append((itemset_output_path, _write_frequent_itemset, (minsup_count, itemset_output_path)))
+
+        for minconf in sorted(minconf_grid):
+            rule_output_path = None
+            if "rule" in stages:
+                rule_output_path = f"{output_prefix}_AR_Minsup_{minsup}_Minconf_{minconf}.{output_format}"
+                tasks.append((rule_output_path, _write_association_rule, (minsup_count, minconf, rule_output_path)))
+
+            sweep_result.append(
+                {
+                    "minsup": minsup,
+                    "minconf": minconf,
+                    # Itemsets with support count >= minsup_count form a prefix of sorted_itemsets
+                    "itemset_count": bisect_right(sorted_supports, -minsup_count),
+                    "rule_count": None,
+                    "itemset_output": itemset_output_path,
+                    "rule_output": rule_output_path,
+                }
+            )
+
+    if workers == 1:
+        _init_worker(sorted_itemsets, constraints)
+        written_counts = {output_path: function(*arguments) for output_path, function, arguments in tasks}
+        _init_worker([], None)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(sorted_itemsets, constraints),
+        ) as executor:
+            futures = {
+                output_path: executor.submit(function, *arguments)
+                for output_path, function, arguments in tasks
+            }
+            written_counts = {output_path: future.result() for output_path, future in futures.items()}
+
+    for point in sweep_result:
+        if point["rule_output"] is not None:
+            point["rule_count"] = written_counts[point["rule_output"]]
+        logger.debug(
+            f"minsup: {point['minsup']}, minconf: {point['minconf']} -> "
+            f"{point['itemset_count']} itemset(s), {point['rule_count']} rule(s)"
+        )
+
+    return sweep_result
@@ -0,0 +1,112 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+from loguru import logger
+
+
+def count_items(transactions: List[List[Any]]) -> Dict[Any, int]:
+    """Count support of each item by scanning transactions
+
+    Args:
+        transactions (List[List[Any]]): List of Transactions. For each transaction, it stores items in List format.
+
+    Returns:
+        Dict[Any, int]: item -> support count
+    """
+    item_support: Dict[Any, int] = {}
+    for transaction in transactions:
+        for item in set(transaction):
+            item_support[item] = item_support.get(item, 0) + 1
+    return item_support
+
+
+def encode_transactions(
+    transactions: List[List[Any]],
+    minsup_count: int,
+    item_support: Dict[Any, int] = None,
+) -> Tuple[List[Tuple[int]], List[Any], List[int]]:
+    """Encode transactions into integer item IDs, keeping 1-frequent items only
+
+    Item IDs are assigned in descending order of support count, so sorted encoded transactions
+    follow the item order of FP-Tree.
+
+    Args:
+        transactions (List[List[Any]]): List of Transactions. For each transaction, it stores items in List format.
+        minsup_count (int): minimum support count
+        item_support (Dict[Any, int], optional): output of count_items(), evaluated if None. Defaults to None.
+
+    Returns:
+        Tuple[List[Tuple[int]], List[Any], List[int]]:
+            (encoded transactions with sorted item IDs, item ID -> item, item ID -> support count)
+    """
+    if item_support is None:
+        item_support = count_items(transactions)
+
+    items = [
+        item
+        for item, support_count in sorted(item_support.items(), key=lambda pair: pair[1], reverse=True)
+        if support_count >= minsup_count
+    ]
+    item_ids = {item: item_id for item_id, item in enumerate(items)}
+
+    # Empty transactions are kept, so that transaction IDs match the input
+    encoded_transactions = [
+        tuple(sorted({item_ids[item] for item in transaction if item in item_ids}))
+        for transaction in transactions
+    ]
+
+    logger.debug(f"Encode {len(encoded_transactions)} transactions with {len(items)} 1-frequent item(s)")
+    return encoded_transactions, items, [item_support[item] for item in items]
+
+
+def build_k_frequent_itemset(itemsets: Iterable[Tuple[Tuple[Any], int]]) -> Dict[int, Dict[Tuple[Any], int]]:
+    """Group (itemset, support count) pairs by length into k-frequent itemset
+
+    Args:
+        itemsets (Iterable[Tuple[Tuple[Any], int]]): (itemset, support count), closed under subsets
+
+    Returns:
+        Dict[int, Dict[Tuple[Any], int]]: k-frequent itemset, terminated with an empty level as the miners do
+    """
+    k_frequent_itemset: Dict[int, Dict[Tuple[Any], int]] = {1: dict()}
+    for itemset, support_count in itemsets:
+        for length in range(len(k_frequent_itemset) + 1, len(itemset) + 1):
+            k_frequent_itemset[length] = dict()
+        k_frequent_itemset[len(itemset)][itemset] = support_count
+
+    # Keep the trailing empty level, find_association_rule() relies on it
+    if len(k_frequent_itemset[len(k_frequent_itemset)]) > 0:
+        k_frequent_itemset[len(k_frequent_itemset) + 1] = dict()
+
+    return k_frequent_itemset
+
+
+def decode_itemset(itemset: Tuple[int], items: List[Any]) -> Tuple[Any]:
+    """Decode itemset of item IDs into itemset in the format of find_frequent_itemset()
+
+    Args:
+        itemset (Tuple[int]): itemset of item IDs
+        items (List[Any]): item ID -> item
+
+    Returns:
+        Tuple[Any]: sorted itemset of items
+    """
+    return tuple(sorted(items[item_id] for item_id in itemset))
+
+
+def decode_k_frequent_itemset(
+    frequent_itemset: Dict[Tuple[int], int],
+    items: List[Any],
+) -> Dict[int, Dict[Tuple[Any], int]]:
+    """Decode frequent itemsets of item IDs into k-frequent itemset
+
+    Args:
+        frequent_itemset (Dict[Tuple[int], int]): itemset of item IDs -> support count
+        items (List[Any]): item ID -> item
+
+    Returns:
+        Dict[int, Dict[Tuple[Any], int]]: k-frequent itemset, terminated with an empty level as the miners do
+    """
+    return build_k_frequent_itemset(
+        (decode_itemset(itemset, items), support_count)
+        for itemset, support_count in frequent_itemset.items()
+    )